@@ -1,7 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+# Optional C JSON encoder for request bodies; requests' stdlib encoding is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def get_brokerage_key(brokerage_name: str) -> str:
     """Convert brokerage name to API brokerage key"""
@@ -31,14 +42,73 @@ def get_brokerage_key(brokerage_name: str) -> str:
     # Generate key from name as fallback
     return normalized_name.lower().replace(' ', '-').replace('_', '-')
 
+# Pooled keep-alive connections per host; at least the number of concurrent load submissions
+HTTP_POOL_SIZE = 32
+
+class TokenBucket:
+    """Thread-safe token bucket: allows bursts of `capacity`, refilled at `rate` tokens per second"""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping only when the bucket is empty"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+class ThrottleRetry(Retry):
+    """Retry that also resubmits non-idempotent requests (POST), but only on 429.
+
+    A throttled request was rejected before being processed, so sending it again
+    cannot create a duplicate; other statuses keep urllib3's per-method rules.
+    """
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
 class LoadsAPIClient:
     def __init__(self, base_url: str, api_key: Optional[str] = None, bearer_token: Optional[str] = None, auth_type: str = 'api_key', brokerage_key: Optional[str] = None):
         self.base_url = base_url.rstrip('/') if base_url else "https://api.prod.goaugment.com"
+        # Built once; create_load posts here for every row
+        self.loads_url = f"{self.base_url}/v2/loads"
         self.api_key = api_key
         self.auth_type = auth_type
         self.bearer_token = bearer_token
         self.brokerage_key = brokerage_key
+        # Serializes token refreshes when loads are submitted from several threads
+        self._token_lock = threading.Lock()
         self.session = requests.Session()
+        # Size the pool for concurrent submissions so connections are reused, not dropped.
+        # Retry's default allowed_methods exclude POST, so loads are otherwise only retried
+        # on connection failures (nothing was sent) and never duplicated; ThrottleRetry adds
+        # 429 for POST, waiting out Retry-After. When retries run out the last response is
+        # returned and reported like any other API error.
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=ThrottleRetry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json'
         })
@@ -105,14 +175,32 @@ class LoadsAPIClient:
         except Exception as e:
             return {'success': False, 'message': f'Token refresh error: {str(e)}'}
     
+    def _refresh_token_once(self, stale_token: Optional[str]) -> Dict[str, Any]:
+        """Refresh the token unless another thread already replaced stale_token"""
+        with self._token_lock:
+            if self.bearer_token and self.bearer_token != stale_token:
+                return {'success': True, 'message': 'Token already refreshed'}
+            return self._refresh_token()
+    
+    def _post_json(self, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST a JSON body, encoded with orjson when it is installed and accepts the payload"""
+        if orjson is not None:
+            try:
+                body = orjson.dumps(payload)
+            except TypeError:
+                # orjson.JSONEncodeError (e.g. non-str keys); let the stdlib encoder handle it
+                body = None
+            if body is not None:
+                # Content-Type: application/json is already a session header
+                return self.session.post(url, data=body, timeout=30)
+        return self.session.post(url, json=payload, timeout=30)
+    
     def create_load(self, load_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a single load via API"""
+        # Token this request is sent with, so a 401 only refreshes if no one else has
+        token_used = self.bearer_token
         try:
-            response = self.session.post(
-                f"{self.base_url}/v2/loads",
-                json=load_data,
-                timeout=30
-            )
+            response = self._post_json(self.loads_url, load_data)
             
             # Handle different response codes explicitly
             if response.status_code == 201:
@@ -198,10 +286,10 @@ class LoadsAPIClient:
             elif response.status_code == 401:
                 # Unauthorized - try token refresh only for API key auth
                 if self.auth_type == 'api_key':
-                    refresh_result = self._refresh_token()
+                    refresh_result = self._refresh_token_once(token_used)
                     if refresh_result['success']:
                         # Retry the request with new token
-                        response = self.session.post(f"{self.base_url}/v2/loads", json=load_data, timeout=30)
+                        response = self._post_json(self.loads_url, load_data)
                         if response.status_code in [200, 201, 204]:
                             try:
                                 response_data = response.json()
@@ -305,18 +393,64 @@ class LoadsAPIClient:
                 'status_code': None
             }
     
-    def bulk_create_loads(self, loads_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Create multiple loads with detailed results"""
-        results = []
+    def iter_create_loads(self, loads_data: List[Dict[str, Any]], max_workers: int = 16,
+                          max_per_second: Optional[float] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Create loads with up to max_workers requests in flight.
         
-        for i, load_data in enumerate(loads_data):
-            result = self.create_load(load_data)
-            result['row_index'] = i + 1
-            results.append(result)
+        The Loads API has no batch endpoint, so round trips are overlapped instead.
+        Yields (index, result) tuples in completion order so callers can report
+        progress as each load finishes. Loads are handed to the pool in a window
+        of 2 * max_workers rather than all up front, so a caller that stops early
+        (error, closed generator) leaves at most that many submissions behind.
+        With max_per_second set, a token bucket holds requests back only once
+        that rate is reached.
+        """
+        if not loads_data:
+            return
+        
+        workers = min(max_workers, len(loads_data))
+        pending_loads = enumerate(loads_data)
+        submit_load = self.create_load
+        if max_per_second:
+            bucket = TokenBucket(max_per_second)
+            
+            def submit_load(load_data):
+                bucket.acquire()
+                return self.create_load(load_data)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            
+            def fill_window():
+                for i, load_data in pending_loads:
+                    in_flight[executor.submit(submit_load, load_data)] = i
+                    if len(in_flight) >= 2 * workers:
+                        break
             
-            # Note: Removed artificial delay - implement proper rate limiting if needed
-            # import time
-            # time.sleep(0.1)
+            fill_window()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            'success': False,
+                            'error': f'Unexpected error: {str(e)}',
+                            'status_code': None
+                        }
+                    yield i, result
+                fill_window()
+    
+    def bulk_create_loads(self, loads_data: List[Dict[str, Any]], max_workers: int = 16,
+                          max_per_second: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Create multiple loads with detailed results, in input order"""
+        results = [None] * len(loads_data)
+        
+        for i, result in self.iter_create_loads(loads_data, max_workers=max_workers, max_per_second=max_per_second):
+            result['row_index'] = i + 1
+            results[i] = result
         
         return results
     
@@ -1,11 +1,12 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Iterable
 import logging
 from datetime import datetime
 import re
 import sys
 import os
+from collections import defaultdict
 
 # Add path to import API schema
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -485,8 +486,11 @@ class DataProcessor:
             self.logger.error(f"Error reading file {file_path}: {str(e)}")
             raise
     
-    def suggest_mapping(self, df_columns: List[str], api_schema: Dict[str, Any], df: Optional[pd.DataFrame] = None) -> Dict[str, str]:
-        """Enhanced smart mapping with regex patterns and value-based inference"""
+    def suggest_mapping(self, df_columns: Iterable[str], api_schema: Dict[str, Any], df: Optional[pd.DataFrame] = None) -> Dict[str, str]:
+        """Enhanced smart mapping with regex patterns and value-based inference
+        
+        df_columns is only iterated, so df.columns can be passed without copying it into a list.
+        """
         suggestions = {}
         
         # Smart mapping rules with regex patterns and confidence scoring
@@ -900,7 +904,7 @@ class DataProcessor:
                 mapping_candidates[api_field].append((column, confidence_score))
     
     def _apply_multi_key_resolution(self, suggestions: Dict[str, str], 
-                                   df_columns: List[str], 
+                                   df_columns: Iterable[str], 
                                    df: Optional[pd.DataFrame]) -> Dict[str, str]:
         """Apply multi-key resolution for related fields"""
         enhanced_suggestions = suggestions.copy()
@@ -966,7 +970,9 @@ class DataProcessor:
     def apply_mapping(self, df: pd.DataFrame, field_mappings: Dict[str, str]) -> Tuple[pd.DataFrame, List[str]]:
         """Apply field mappings to DataFrame"""
         errors = []
-        mapped_df = pd.DataFrame()
+        # Collect whole columns (or scalars for constant values) and build the frame once,
+        # instead of inserting into an empty DataFrame column by column
+        columns = {}
         
         for api_field, csv_column in field_mappings.items():
             if csv_column.startswith("MANUAL_VALUE:"):
@@ -991,17 +997,20 @@ class DataProcessor:
                                 manual_value = enum_values[0]
                 
                 # Apply manual value to all records
-                mapped_df[api_field] = [manual_value] * len(df)
+                columns[api_field] = manual_value
                 self.logger.info(f"Applied manual value '{manual_value}' to {len(df)} records for {api_field}")
             elif csv_column.startswith("DEFAULT_VALUE:"):
                 # Handle default values - apply to all rows
                 default_value = csv_column.replace("DEFAULT_VALUE:", "")
-                mapped_df[api_field] = [default_value] * len(df)
+                columns[api_field] = default_value
             elif csv_column in df.columns:
-                mapped_df[api_field] = df[csv_column]
+                columns[api_field] = df[csv_column]
             else:
                 errors.append(f"Column '{csv_column}' not found in uploaded file")
         
+        # Scalars broadcast over the upload's index; mapped columns share it already
+        mapped_df = pd.DataFrame(columns, index=df.index)
+        
         # Auto-generate sequence numbers for route stops
         self._add_auto_generated_fields(mapped_df)
         
@@ -1026,7 +1035,7 @@ class DataProcessor:
             # Assign sequences based on sorted stop indices
             for stop_idx in sorted(stops.keys()):
                 sequence_field = f"load.route.{stop_idx}.sequence"
-                df[sequence_field] = [stop_idx + 1] * len(df)  # 1-based sequence
+                df[sequence_field] = stop_idx + 1  # 1-based sequence
         
         # Add default items if none specified but weight/quantity exists
         weight_cols = [col for col in df.columns if 'weight' in col.lower() or 'totalWeightLbs' in col]
@@ -1036,7 +1045,7 @@ class DataProcessor:
         if (weight_cols or quantity_cols) and not any(col.startswith('load.items.') for col in df.columns):
             # Add basic item structure with default quantity if not present
             if not any('load.items.0.quantity' in col for col in df.columns):
-                df['load.items.0.quantity'] = [1] * len(df)  # Default to 1 item
+                df['load.items.0.quantity'] = 1  # Default to 1 item
             
             # If weight column exists but not mapped to items, try to use it
             if weight_cols and not any('load.items.0.totalWeightLbs' in col for col in df.columns):
@@ -1066,8 +1075,9 @@ class DataProcessor:
                 validation_errors.extend(chunk_errors)
                 
                 # Track valid indices
+                chunk_error_rows = {error['row'] for error in chunk_errors}
                 chunk_valid_indices = [start_idx + i for i in range(len(chunk_df)) 
-                                     if not any(error['row'] == start_idx + i + 1 for error in chunk_errors)]
+                                     if start_idx + i + 1 not in chunk_error_rows]
                 valid_indices.extend(chunk_valid_indices)
             
             # Create valid DataFrame from all valid indices
@@ -1076,11 +1086,87 @@ class DataProcessor:
         else:
             # Process normally for small files
             validation_errors = self._validate_chunk(df, 0)
+            error_rows = {error['row'] for error in validation_errors}
             valid_indices = [i for i in range(len(df)) 
-                           if not any(error['row'] == i + 1 for error in validation_errors)]
+                           if i + 1 not in error_rows]
             valid_df = df.iloc[valid_indices].copy()
             return valid_df, validation_errors
-    
+
+    def validate_data_vectorized(self, df: pd.DataFrame, api_schema: Dict[str, Any],
+                                 include_data: bool = True,
+                                 max_errors: Optional[int] = None) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """Column-at-a-time equivalent of validate_data
+
+        Each schema field is checked with whole-Series operations; only the rows
+        flagged by those masks go through the per-value checks, so errors and
+        messages match _validate_chunk exactly. With include_data=False the
+        error records omit the 'data' copy of the row; max_errors limits how many
+        error records are built (the returned valid rows are unaffected).
+        """
+        row_errors = defaultdict(list)
+
+        # Conditional requirements depend only on which columns are present, so they are the same for every row
+        required_fields = self._get_required_fields_from_schema(df.iloc[0]) if len(df) else []
+
+        for field in required_fields:
+            if field in df.columns:
+                missing_positions = np.flatnonzero(self._blank_mask(df[field]).to_numpy())
+            else:
+                missing_positions = range(len(df))
+            if len(missing_positions):
+                error_msg = f"Missing required field: {field} ({self._get_field_description(field)})"
+                for pos in missing_positions:
+                    row_errors[pos].append(error_msg)
+
+        for field_name in df.columns:
+            if field_name in required_fields or field_name not in self.api_schema:
+                continue
+
+            series = df[field_name]
+            field_info = self.api_schema.get(field_name, {})
+            present = ~self._blank_mask(series)
+
+            # Candidate rows are a superset of the failures; _validate_optional_field has the final say
+            suspect = pd.Series(False, index=series.index)
+            if field_info.get('enum'):
+                valid_values = {str(val).lower() for val in field_info['enum']}
+                suspect |= ~series.astype(str).str.lower().isin(valid_values)
+            try:
+                if field_info.get('type') in ['number', 'integer']:
+                    if series.dtype.kind in 'biufO':
+                        suspect |= pd.to_numeric(series, errors='coerce').isna()
+                    else:
+                        # to_numeric turns datetimes/timedeltas into integers that float() would reject
+                        suspect[:] = True
+                if field_info.get('type') == 'date':
+                    suspect |= pd.to_datetime(series, errors='coerce').isna()
+            except (ValueError, TypeError):
+                # Column-level parsing gave up (e.g. mixed timezones); check every present value
+                suspect[:] = True
+
+            for pos in np.flatnonzero((present & suspect).to_numpy()):
+                is_valid, error_msg = self._validate_optional_field(field_name, series.iat[pos])
+                if not is_valid and error_msg:
+                    row_errors[pos].append(error_msg)
+
+        error_positions = sorted(row_errors)[:max_errors]
+        if include_data:
+            validation_errors = [
+                {'row': pos + 1, 'errors': row_errors[pos], 'data': df.iloc[pos].to_dict()}
+                for pos in error_positions
+            ]
+        else:
+            validation_errors = [{'row': pos + 1, 'errors': row_errors[pos]} for pos in error_positions]
+
+        valid_mask = np.ones(len(df), dtype=bool)
+        valid_mask[list(row_errors)] = False
+        return df[valid_mask].copy(), validation_errors
+
+    @staticmethod
+    def _blank_mask(series: pd.Series) -> pd.Series:
+        """Vectorized form of the per-value `pd.isna(v) or str(v).strip() == ''` check"""
+        return series.isna() | (series.astype(str).str.strip() == '')
+
     def _validate_chunk(self, df: pd.DataFrame, start_row_offset: int = 0) -> List[Dict[str, Any]]:
         """Validate a chunk of DataFrame"""
         validation_errors = []
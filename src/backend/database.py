@@ -7,7 +7,17 @@ import hashlib
 from datetime import datetime
 from cryptography.fernet import Fernet
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
+
+class DetailedError(NamedTuple):
+    """One processing_errors row; save_processing_errors also accepts the equivalent dict"""
+    row_number: Optional[int]
+    field_name: str
+    error_type: str
+    error_message: str
+    suggested_fix: str
+    original_value: str
+    expected_format: str
 
 class DatabaseManager:
     def __init__(self, db_path="data/freight_loader.db"):
@@ -363,7 +373,7 @@ class DatabaseManager:
             }
 
     def import_data(self, import_file_path):
-        """Import data from export file"""
+        """Import data from export file (a zip archive path or binary file-like object)"""
         try:
             # Extract and read import file
             with zipfile.ZipFile(import_file_path, 'r') as zipf:
@@ -373,7 +383,19 @@ class DatabaseManager:
                     return {'success': False, 'error': 'No JSON data file found in archive'}
                 
                 json_content = zipf.read(json_files[0])
-                import_data = json.loads(json_content)
+        except Exception as e:
+            logging.error(f"Error importing data: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        
+        return self.import_data_from_json(json_content)
+
+    def import_data_from_json(self, json_content):
+        """Import data from an in-memory export/backup JSON document (str or bytes)"""
+        try:
+            import_data = json.loads(json_content)
             
             # Validate import data structure - support both old and new formats
             has_old_format = all(key in import_data for key in ['export_info', 'customer_mappings', 'upload_history'])
@@ -387,118 +409,142 @@ class DatabaseManager:
             imported_configurations = 0
             imported_history = 0
             
+            # Validate brokerage configurations (new format) up front; they are saved below
+            # inside the same transaction as the rest of the restore
+            config_rows = []
+            if 'brokerage_configurations' in import_data:
+                logging.info(f"Found {len(import_data['brokerage_configurations'])} configurations to import")
+                for config in import_data['brokerage_configurations']:
+                    config_name = config.get('configuration_name', 'Unknown')
+                    brokerage_name = config.get('brokerage_name', 'Unknown')
+                    logging.info(f"Processing configuration '{config_name}' for brokerage '{brokerage_name}'")
+                    
+                    # Validate that we have the minimum required data
+                    if not config.get('brokerage_name') or not config.get('configuration_name'):
+                        logging.warning(f"Skipping configuration with missing brokerage_name or configuration_name")
+                        continue
+                    
+                    # Ensure required fields exist with defaults
+                    auth_type = config.get('auth_type', 'api_key')
+                    field_mappings = config.get('field_mappings', {})
+                    api_credentials = config.get('api_credentials', {})
+                    bearer_token = config.get('bearer_token')
+                    
+                    logging.info(f"Configuration '{config_name}' has auth_type='{auth_type}', api_credentials keys: {list(api_credentials.keys())}, bearer_token present: {bearer_token is not None}")
+                    
+                    # Validate API credentials exist (don't create placeholders)
+                    if auth_type == 'api_key' and not api_credentials.get('api_key'):
+                        logging.warning(f"Skipping configuration '{config_name}' - missing API key")
+                        continue
+                    elif auth_type == 'bearer_token' and not bearer_token:
+                        logging.warning(f"Skipping configuration '{config_name}' - missing bearer token")
+                        continue
+                    
+                    # Ensure base_url exists
+                    if not api_credentials.get('base_url'):
+                        api_credentials['base_url'] = 'https://api.prod.goaugment.com'
+                    
+                    config_rows.append(dict(
+                        brokerage_name=config['brokerage_name'],
+                        configuration_name=config['configuration_name'],
+                        field_mappings=field_mappings,
+                        api_credentials=api_credentials,
+                        file_headers=config.get('file_headers'),
+                        description=config.get('description', ''),
+                        auth_type=auth_type,
+                        bearer_token=bearer_token
+                    ))
+            
+            # Legacy customer mappings (skip API credentials for security) and upload history
+            # are plain row inserts: batch each table into one executemany in a single transaction
+            now = datetime.now().isoformat()
+            mapping_rows = [
+                (
+                    mapping['customer_name'],
+                    json.dumps(mapping['field_mappings']),
+                    json.dumps({'base_url': '', 'api_key': ''}),  # Empty credentials
+                    mapping.get('created_at', now),
+                    mapping.get('updated_at', now)
+                )
+                for mapping in import_data.get('customer_mappings', [])
+            ]
+            history_rows = [
+                (
+                    record.get('brokerage_name', record.get('customer_name', 'Unknown')),  # Handle both old and new formats
+                    record.get('filename', 'unknown_file.csv'),
+                    record.get('total_records', 0),
+                    record.get('successful_records', 0),
+                    record.get('failed_records', 0),
+                    json.dumps(record.get('error_log')) if record.get('error_log') else None,
+                    record.get('upload_timestamp', now)
+                )
+                for record in import_data['upload_history']
+            ]
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             try:
-                # Import customer mappings (skip API credentials for security) - legacy format
-                if 'customer_mappings' in import_data:
-                    for mapping in import_data['customer_mappings']:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO customer_mappings 
-                            (customer_name, field_mappings, api_credentials, created_at, updated_at)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (
-                            mapping['customer_name'],
-                            json.dumps(mapping['field_mappings']),
-                            json.dumps({'base_url': '', 'api_key': ''}),  # Empty credentials
-                            mapping.get('created_at', datetime.now().isoformat()),
-                            mapping.get('updated_at', datetime.now().isoformat())
-                        ))
-                        imported_mappings += 1
+                # One commit covers the whole restore, so per-page fsyncs are not needed
+                cursor.execute('PRAGMA synchronous = NORMAL')
+                cursor.execute('BEGIN')
                 
-                # Import brokerage configurations - new format
-                if 'brokerage_configurations' in import_data:
-                    logging.info(f"Found {len(import_data['brokerage_configurations'])} configurations to import")
-                    for config in import_data['brokerage_configurations']:
-                        config_name = config.get('configuration_name', 'Unknown')
-                        brokerage_name = config.get('brokerage_name', 'Unknown')
-                        logging.info(f"Processing configuration '{config_name}' for brokerage '{brokerage_name}'")
-                        
-                        # Validate that we have the minimum required data
-                        if not config.get('brokerage_name') or not config.get('configuration_name'):
-                            logging.warning(f"Skipping configuration with missing brokerage_name or configuration_name")
-                            continue
-                        
-                        # Ensure required fields exist with defaults
-                        auth_type = config.get('auth_type', 'api_key')
-                        field_mappings = config.get('field_mappings', {})
-                        api_credentials = config.get('api_credentials', {})
-                        bearer_token = config.get('bearer_token')
-                        
-                        logging.info(f"Configuration '{config_name}' has auth_type='{auth_type}', api_credentials keys: {list(api_credentials.keys())}, bearer_token present: {bearer_token is not None}")
-                        
-                        # Validate API credentials exist (don't create placeholders)
-                        if auth_type == 'api_key' and not api_credentials.get('api_key'):
-                            logging.warning(f"Skipping configuration '{config_name}' - missing API key")
-                            continue
-                        elif auth_type == 'bearer_token' and not bearer_token:
-                            logging.warning(f"Skipping configuration '{config_name}' - missing bearer token")
-                            continue
-                        
-                        # Ensure base_url exists
-                        if not api_credentials.get('base_url'):
-                            api_credentials['base_url'] = 'https://api.prod.goaugment.com'
-                        
-                        try:
-                            # Use the save_brokerage_configuration method to ensure proper encryption and validation
-                            self.save_brokerage_configuration(
-                                brokerage_name=config['brokerage_name'],
-                                configuration_name=config['configuration_name'],
-                                field_mappings=field_mappings,
-                                api_credentials=api_credentials,
-                                file_headers=config.get('file_headers'),
-                                description=config.get('description', ''),
-                                auth_type=auth_type,
-                                bearer_token=bearer_token
-                            )
-                            imported_configurations += 1
-                            logging.info(f"Successfully imported configuration '{config_name}' for brokerage '{brokerage_name}'")
-                        except Exception as config_error:
-                            logging.error(f"Error importing configuration '{config_name}': {config_error}")
-                            # Continue with other configurations
+                for config in config_rows:
+                    # A savepoint per configuration lets a bad one be skipped without
+                    # discarding the rest of the restore
+                    cursor.execute('SAVEPOINT restore_config')
+                    try:
+                        # Use the save_brokerage_configuration method to ensure proper encryption and validation
+                        self.save_brokerage_configuration(**config, conn=conn)
+                        cursor.execute('RELEASE restore_config')
+                        imported_configurations += 1
+                        logging.info(f"Successfully imported configuration '{config['configuration_name']}' for brokerage '{config['brokerage_name']}'")
+                    except Exception as config_error:
+                        cursor.execute('ROLLBACK TO restore_config')
+                        cursor.execute('RELEASE restore_config')
+                        logging.error(f"Error importing configuration '{config['configuration_name']}': {config_error}")
+                        # Continue with other configurations
                 
-                # Import upload history
-                for record in import_data['upload_history']:
-                    cursor.execute('''
+                if mapping_rows:
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO customer_mappings 
+                        (customer_name, field_mappings, api_credentials, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', mapping_rows)
+                    imported_mappings = len(mapping_rows)
+                
+                if history_rows:
+                    cursor.executemany('''
                         INSERT INTO upload_history 
                         (brokerage_name, filename, total_records, successful_records, failed_records, error_log, upload_timestamp)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        record.get('brokerage_name', record.get('customer_name', 'Unknown')),  # Handle both old and new formats
-                        record.get('filename', 'unknown_file.csv'),
-                        record.get('total_records', 0),
-                        record.get('successful_records', 0),
-                        record.get('failed_records', 0),
-                        json.dumps(record.get('error_log')) if record.get('error_log') else None,
-                        record.get('upload_timestamp', datetime.now().isoformat())
-                    ))
-                    imported_history += 1
-                
-                # Import learning data if present
-                imported_learning = 0
-                if 'learning_data' in import_data:
-                    try:
-                        self.import_learning_data(import_data['learning_data'])
-                        imported_learning = 1
-                    except Exception as e:
-                        logging.error(f"Error importing learning data: {e}")
+                    ''', history_rows)
+                    imported_history = len(history_rows)
                 
                 conn.commit()
                 
-                return {
-                    'success': True,
-                    'imported_mappings': imported_mappings,
-                    'imported_configurations': imported_configurations,
-                    'imported_history': imported_history,
-                    'imported_learning': imported_learning
-                }
-                
             except Exception as e:
                 conn.rollback()
                 raise e
             finally:
                 conn.close()
+            
+            # Import learning data if present (after commit, it uses its own connection)
+            imported_learning = 0
+            if 'learning_data' in import_data:
+                try:
+                    self.import_learning_data(import_data['learning_data'])
+                    imported_learning = 1
+                except Exception as e:
+                    logging.error(f"Error importing learning data: {e}")
+            
+            return {
+                'success': True,
+                'imported_mappings': imported_mappings,
+                'imported_configurations': imported_configurations,
+                'imported_history': imported_history,
+                'imported_learning': imported_learning
+            }
                 
         except Exception as e:
             logging.error(f"Error importing data: {e}")
@@ -795,41 +841,51 @@ class DatabaseManager:
         conn.close()
     
     def get_upload_history(self, brokerage_name=None, limit: Optional[int] = 50):
-        """Retrieve upload history - legacy method updated to use brokerage_name"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Retrieve upload history - legacy method updated to use brokerage_name
         
-        if brokerage_name:
-            if limit is None:
-                cursor.execute('''
-                    SELECT * FROM upload_history 
-                    WHERE brokerage_name = ?
-                    ORDER BY upload_timestamp DESC
-                ''', (brokerage_name,))
-            else:
-                cursor.execute('''
-                    SELECT * FROM upload_history 
-                    WHERE brokerage_name = ?
-                    ORDER BY upload_timestamp DESC
-                    LIMIT ?
-                ''', (brokerage_name, limit))
+        Rows are sqlite3.Row objects: they support both positional and
+        column-name access.
+        """
+        return list(self.iter_upload_history(brokerage_name, limit))
+    
+    # Columns callers may request from iter_upload_history (names are interpolated into SQL)
+    UPLOAD_HISTORY_COLUMNS = frozenset({
+        'id', 'brokerage_name', 'configuration_name', 'filename', 'total_records',
+        'successful_records', 'failed_records', 'error_log', 'processing_time_seconds',
+        'file_headers', 'upload_timestamp', 'session_id'
+    })
+    
+    def iter_upload_history(self, brokerage_name=None, limit: Optional[int] = 50, columns=None):
+        """Yield upload history rows (sqlite3.Row), newest first, straight from the cursor
+        
+        Pass columns to select only those fields, e.g. to skip the large error_log
+        and file_headers blobs; by default every column is returned.
+        """
+        if columns:
+            unknown = set(columns) - self.UPLOAD_HISTORY_COLUMNS
+            if unknown:
+                raise ValueError(f"Unknown upload_history columns: {sorted(unknown)}")
+            query = f"SELECT {', '.join(columns)} FROM upload_history"
         else:
-            if limit is None:
-                cursor.execute('''
-                    SELECT * FROM upload_history 
-                    ORDER BY upload_timestamp DESC
-                ''')
-            else:
-                cursor.execute('''
-                    SELECT * FROM upload_history 
-                    ORDER BY upload_timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
+            query = 'SELECT * FROM upload_history'
+        params = []
         
-        results = cursor.fetchall()
-        conn.close()
+        if brokerage_name:
+            query += ' WHERE brokerage_name = ?'
+            params.append(brokerage_name)
         
-        return results
+        query += ' ORDER BY upload_timestamp DESC'
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield from conn.execute(query, params)
+        finally:
+            conn.close()
     
     def _get_encryption_key(self):
         """Get or create encryption key for API credentials"""
@@ -879,8 +935,12 @@ class DatabaseManager:
             raise
         return key 
 
-    def save_brokerage_configuration(self, brokerage_name, configuration_name, field_mappings, api_credentials, file_headers=None, description=None, auth_type='api_key', bearer_token=None):
-        """Save or update brokerage configuration with versioning"""
+    def save_brokerage_configuration(self, brokerage_name, configuration_name, field_mappings, api_credentials, file_headers=None, description=None, auth_type='api_key', bearer_token=None, conn=None):
+        """Save or update brokerage configuration with versioning
+        
+        When conn is given the writes join the caller's transaction, which is
+        responsible for committing; otherwise the configuration is committed here.
+        """
         # Input validation
         if not brokerage_name or not isinstance(brokerage_name, str):
             raise ValueError("Invalid brokerage name")
@@ -888,7 +948,7 @@ class DatabaseManager:
             raise ValueError("Invalid configuration name")
         
         # Ensure brokerage exists in brokerages table
-        self.create_brokerage(brokerage_name)
+        self.create_brokerage(brokerage_name, conn=conn)
         
         if len(brokerage_name) > 100:
             raise ValueError("Brokerage name too long")
@@ -902,7 +962,9 @@ class DatabaseManager:
         safe_brokerage_name = re.sub(r'[^\w\s-]', '', brokerage_name.strip())[:100]
         safe_configuration_name = re.sub(r'[^\w\s-]', '', configuration_name.strip())[:100]
         
-        conn = sqlite3.connect(self.db_path)
+        owns_conn = conn is None
+        if owns_conn:
+            conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
@@ -984,15 +1046,18 @@ class DatabaseManager:
                     None, json.dumps(field_mappings)
                 )
             
-            conn.commit()
+            if owns_conn:
+                conn.commit()
             return config_id
             
         except Exception as e:
-            conn.rollback()
+            if owns_conn:
+                conn.rollback()
             logging.error(f"Error saving brokerage configuration: {e}")
             raise
         finally:
-            conn.close()
+            if owns_conn:
+                conn.close()
 
     def get_brokerage_configurations(self, brokerage_name):
         """Get all configurations for a brokerage"""
@@ -1094,9 +1159,13 @@ class DatabaseManager:
         conn.commit()
         conn.close()
 
-    def create_brokerage(self, brokerage_name):
-        """Create a new brokerage entry"""
+    def create_brokerage(self, brokerage_name, conn=None):
+        """Create a new brokerage entry (inside the caller's transaction when conn is given)"""
         try:
+            if conn is not None:
+                conn.execute('INSERT OR IGNORE INTO brokerages (name) VALUES (?)', (brokerage_name,))
+                return True
+            
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
@@ -1294,19 +1363,23 @@ class DatabaseManager:
             return default
         
         for error in errors_list:
-            # Validate that error is a dictionary
-            if not isinstance(error, dict):
+            # Accept DetailedError records as-is and dicts with the same keys
+            if isinstance(error, dict):
+                record = DetailedError(*(error.get(name) for name in DetailedError._fields))
+            elif isinstance(error, DetailedError):
+                record = error
+            else:
                 logging.warning(f"Skipping invalid error record: {error}")
                 continue
             
             # Extract and validate error fields
-            row_number = safe_convert_to_int(error.get('row_number'))
-            field_name = safe_convert_to_str(error.get('field_name'))
-            error_type = safe_convert_to_str(error.get('error_type'))
-            error_message = safe_convert_to_str(error.get('error_message'))
-            suggested_fix = safe_convert_to_str(error.get('suggested_fix'))
-            original_value = safe_convert_to_str(error.get('original_value'))
-            expected_format = safe_convert_to_str(error.get('expected_format'))
+            row_number = safe_convert_to_int(record.row_number)
+            field_name = safe_convert_to_str(record.field_name)
+            error_type = safe_convert_to_str(record.error_type)
+            error_message = safe_convert_to_str(record.error_message)
+            suggested_fix = safe_convert_to_str(record.suggested_fix)
+            original_value = safe_convert_to_str(record.original_value)
+            expected_format = safe_convert_to_str(record.expected_format)
             
             # Skip if essential fields are missing
             if not error_type or not error_message:
@@ -1333,12 +1406,14 @@ class DatabaseManager:
         conn.close()
 
     def get_brokerage_upload_history(self, brokerage_name, limit=50):
-        """Get upload history for a specific brokerage"""
+        """Get upload history for a specific brokerage as a list of dicts keyed by column name"""
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         cursor.execute('''
-            SELECT h.*, COUNT(e.id) as error_count
+            SELECT h.*, COUNT(e.id) as error_count,
+                   COALESCE(CAST(h.successful_records AS REAL) / NULLIF(h.total_records, 0) * 100, 0) as success_rate
             FROM upload_history h
             LEFT JOIN processing_errors e ON h.id = e.upload_history_id
             WHERE h.brokerage_name = ?
@@ -1347,7 +1422,8 @@ class DatabaseManager:
             LIMIT ?
         ''', (brokerage_name, limit))
         
-        results = cursor.fetchall()
+        # Plain dicts so callers can cache (pickle) the result
+        results = [dict(row) for row in cursor.fetchall()]
         conn.close()
         
         return results
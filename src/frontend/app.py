@@ -1,17 +1,33 @@
 import streamlit as st
-import pandas as pd
-import json
 import os
 import sys
+
+# Add parent directory to path to enable src imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.frontend.auth import check_password, show_login_page
+
+# Logged-out visitors only need the login form; stop before the pandas/backend imports below.
+# (streamlit_app.py runs the same gate before importing this module; main() checks again.)
+if __name__ == "__main__" and not check_password():
+    show_login_page()
+    st.stop()
+
+import pandas as pd
+import json
+import time
 from datetime import datetime
+from types import MappingProxyType
 import logging
 import re
+import io
+import zipfile
 import hashlib
+import importlib.util
+from collections import defaultdict
+from dataclasses import dataclass
 
-# Add parent directory to path to enable src imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.backend.database import DatabaseManager
+from src.backend.database import DatabaseManager, DetailedError
 from src.backend.api_client import LoadsAPIClient, get_brokerage_key
 from src.backend.data_processor import DataProcessor
 from src.frontend.ui_components import (
@@ -37,7 +53,8 @@ from src.frontend.ui_components import (
     create_learning_analytics_dashboard,
     update_learning_with_processing_results,
     get_full_api_schema,
-    get_dynamic_field_requirements
+    get_dynamic_field_requirements,
+    suggest_mapping_cached
 )
 
 # Import configuration update functions
@@ -71,6 +88,34 @@ except (OSError, PermissionError):
 
 logger = logging.getLogger(__name__)
 
+# pandas can hand CSV tokenizing to pyarrow's multithreaded reader when it is installed
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+# Rust-backed Excel reader, used as engine='calamine' when installed; the engine only
+# exists from pandas 2.2, so older pandas skips the attempt instead of failing every read
+CALAMINE_AVAILABLE = (
+    tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2) and
+    importlib.util.find_spec('python_calamine') is not None
+)
+# Optional C JSON encoder for the upload history error log
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Static API schema shared by validation and the status renderers; read-only by convention
+API_SCHEMA = get_full_api_schema()
+
+# Maximum number of load submissions kept in flight against the API at once
+API_SUBMISSION_CONCURRENCY = 16
+# Ceiling on load submissions per second (token bucket); None leaves them unthrottled
+API_SUBMISSION_RATE_LIMIT = 20
+# Minimum seconds between repaints of the submission progress and live error widgets
+API_PROGRESS_UPDATE_INTERVAL = 0.1
+
+# Scoped reruns for self-contained panels (st.fragment on Streamlit >= 1.37,
+# st.experimental_fragment on 1.33-1.36); plain function call on older versions
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
 # Session management functions
 def generate_session_id():
     """Generate a unique session ID for learning tracking"""
@@ -83,75 +128,6 @@ def ensure_session_id():
         st.session_state.session_id = generate_session_id()
     return st.session_state.session_id
 
-# Authentication functions
-def check_password():
-    """Check if the user is authenticated"""
-    return st.session_state.get('authenticated', False)
-
-def authenticate_user(password):
-    """Authenticate user with password"""
-    try:
-        # Get password from secrets
-        if 'auth' in st.secrets and 'APP_PASSWORD' in st.secrets.auth:
-            correct_password = st.secrets.auth.APP_PASSWORD
-        else:
-            # Fallback for local development
-            correct_password = "admin123"
-        
-        return password == correct_password
-    except Exception as e:
-        logger.error(f"Authentication error: {e}")
-        return False
-
-def show_login_page():
-    """Display login page"""
-    st.set_page_config(
-        page_title="FF2API - Login",
-        page_icon="🔐",
-        layout="centered"
-    )
-    
-    # Center the login form
-    col1, col2, col3 = st.columns([1, 2, 1])
-    
-    with col2:
-        st.markdown("""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <h1>🔐 FF2API Access</h1>
-                <p style="color: #666; font-size: 1.1rem;">Enter your team password to continue</p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Login form
-        with st.form("login_form"):
-            password = st.text_input(
-                "Password",
-                type="password",
-                placeholder="Enter team password",
-                help="Contact your team administrator if you don't have the password"
-            )
-            
-            submitted = st.form_submit_button("🚀 Access Application", use_container_width=True)
-            
-            if submitted:
-                if authenticate_user(password):
-                    st.session_state.authenticated = True
-                    st.session_state.login_time = datetime.now()
-                    st.success("✅ Access granted! Redirecting...")
-                    st.rerun()
-                else:
-                    st.error("❌ Incorrect password. Please try again.")
-                    st.info("💡 Contact your team administrator if you need help accessing the application.")
-        
-        # App info
-        st.markdown("---")
-        st.markdown("""
-            <div style="text-align: center; color: #666; font-size: 0.9rem;">
-                <p><strong>FF2API</strong> - Freight File to API Processing Tool</p>
-                <p>For internal company use only</p>
-            </div>
-        """, unsafe_allow_html=True)
-
 def show_logout_option():
     """Show logout option in sidebar"""
     with st.sidebar:
@@ -168,52 +144,91 @@ def show_logout_option():
         if st.button("🚪 Logout", key="logout_btn", use_container_width=True):
             # Clear authentication
             st.session_state.authenticated = False
-            if 'login_time' in st.session_state:
-                del st.session_state.login_time
+            st.session_state.pop('login_time', None)
             
             # Clear sensitive data
-            keys_to_clear = ['api_credentials', 'selected_configuration', 'uploaded_df']
+            keys_to_clear = ['api_credentials', 'selected_configuration', 'uploaded_df', 'uploaded_df_head']
             for key in keys_to_clear:
-                if key in st.session_state:
-                    del st.session_state[key]
+                st.session_state.pop(key, None)
             
             st.info("👋 Logged out successfully")
             st.rerun()
 
+# Minimum seconds between upload-directory sweeps within one session
+UPLOAD_CLEANUP_INTERVAL = 300
+
 def cleanup_old_uploads():
     """Clean up old uploaded files for security"""
+    # Runs on every rerun; sweep at most once per interval per session
+    now = time.time()
+    if now - st.session_state.get('_last_upload_cleanup', 0) < UPLOAD_CLEANUP_INTERVAL:
+        return
+    st.session_state._last_upload_cleanup = now
+    
     try:
         uploads_dir = "data/uploads"
-        if os.path.exists(uploads_dir):
-            current_time = datetime.now()
-            for filename in os.listdir(uploads_dir):
-                file_path = os.path.join(uploads_dir, filename)
-                if os.path.isfile(file_path):
-                    file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    # Delete files older than 1 hour
-                    if (current_time - file_time).total_seconds() > 3600:
-                        os.remove(file_path)
-                        logging.info(f"Cleaned up old upload: {filename}")
+        # Delete files older than 1 hour; compare raw epoch seconds against a fixed cutoff
+        cutoff = now - 3600
+        # scandir entries carry the file type and stat from the directory listing
+        with os.scandir(uploads_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    logging.info(f"Cleaned up old upload: {entry.name}")
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logging.warning(f"Error cleaning up uploads: {e}")
 
+MAX_VALIDATION_ERRORS = 500
+
 def validate_mapping(df, field_mappings, data_processor):
-    """Validate the current mapping"""
+    """Validate the current mapping
+    
+    Returns (errors, error_count); at most MAX_VALIDATION_ERRORS error records are
+    built, error_count is the full number of failing rows or mapping errors.
+    """
     try:
         # Apply mapping
         mapped_df, mapping_errors = data_processor.apply_mapping(df, field_mappings)
         
         if mapping_errors:
-            return [{'row': i, 'errors': [error]} for i, error in enumerate(mapping_errors)]
+            return ([{'row': i, 'errors': [error]} for i, error in enumerate(mapping_errors[:MAX_VALIDATION_ERRORS])],
+                    len(mapping_errors))
         
-        # Use the full API schema for validation
-        api_schema = get_full_api_schema()
-        valid_df, validation_errors = data_processor.validate_data(mapped_df, api_schema)
+        # Use the full API schema for validation; the result is only displayed and kept in
+        # session state, so skip the per-row copy of the mapped data
+        api_schema = API_SCHEMA
+        valid_df, validation_errors = data_processor.validate_data_vectorized(
+            mapped_df, api_schema, include_data=False, max_errors=MAX_VALIDATION_ERRORS)
         
-        return validation_errors
+        return validation_errors, len(mapped_df) - len(valid_df)
     except Exception as e:
         logger.error(f"Validation error: {str(e)}")
-        return [{'row': 1, 'errors': [f"Validation failed: {str(e)}"]}]
+        return [{'row': 1, 'errors': [f"Validation failed: {str(e)}"]}], 1
+
+def _mappings_digest(field_mappings):
+    """Content digest of a field-mapping dict; changes whenever any mapping is edited"""
+    return hashlib.blake2b(
+        json.dumps(field_mappings, sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+
+def _validate_mapping_cached(df, field_mappings, data_processor):
+    """validate_mapping memoized in session state on (upload digest, mappings digest)
+    
+    Reruns from unrelated widgets reuse the previous result; a new upload or any
+    mapping change produces a new key and revalidates.
+    """
+    state = st.session_state
+    key = (state.get('uploaded_file_hash') or id(df), _mappings_digest(field_mappings))
+    
+    cached = state.get('_validation_cache')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    result = validate_mapping(df, field_mappings, data_processor)
+    state._validation_cache = (key, result)
+    return result
 
 def get_api_credentials():
     """Get API credentials from session state"""
@@ -221,18 +236,52 @@ def get_api_credentials():
 
 def clear_api_credentials():
     """Clear API credentials from session state"""
-    if 'api_credentials' in st.session_state:
-        del st.session_state.api_credentials
+    st.session_state.pop('api_credentials', None)
 
 def normalize_column_names(df):
     """Normalize column names for consistency"""
-    df.columns = df.columns.str.strip().str.replace(' ', '_').str.lower()
+    # str.split() trims and splits on whitespace runs in C, so spaces/tabs collapse to one underscore
+    df.columns = ['_'.join(str(col).split()).lower() for col in df.columns]
     return df
 
+@st.cache_resource
+def _get_db_manager():
+    """Shared DatabaseManager; construction runs schema setup and migrations, so do it once.
+    
+    DatabaseManager opens a short-lived SQLite connection per call, so one
+    instance is safe to share across reruns and sessions.
+    """
+    return DatabaseManager()
+
+def _db_version(db_manager):
+    """Modification time of the SQLite file; changes whenever a write is committed"""
+    try:
+        return os.path.getmtime(db_manager.db_path)
+    except OSError:
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_brokerages(_db_manager, db_version):
+    """Brokerage list for the sidebar; db_version keys the entry so any DB write refreshes it"""
+    return _db_manager.get_all_brokerages()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_configurations(_db_manager, brokerage_name, db_version):
+    """Configurations for a brokerage; db_version keys the entry so any DB write refreshes it"""
+    return _db_manager.get_brokerage_configurations(brokerage_name)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_recent_uploads(_db_manager, brokerage_name, limit, db_version):
+    """Recent upload history for a brokerage; db_version keys the entry so any DB write refreshes it"""
+    return _db_manager.get_brokerage_upload_history(brokerage_name, limit=limit)
+
+@st.cache_resource
+def _get_data_processor():
+    """Shared DataProcessor; it holds only the schema tables built in __init__"""
+    return DataProcessor()
+
 def init_components():
-    db_manager = DatabaseManager()
-    data_processor = DataProcessor()
-    return db_manager, data_processor
+    return _get_db_manager(), _get_data_processor()
 
 def main():
     # Check authentication first
@@ -247,6 +296,9 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Per-rerun counter used to scope values that are computed once per script run
+    st.session_state._rerun_id = st.session_state.get('_rerun_id', 0) + 1
+    
     # Force sidebar to stay expanded after file upload
     if 'sidebar_state' not in st.session_state:
         st.session_state.sidebar_state = 'expanded'
@@ -271,8 +323,7 @@ def main():
         # Clear any cached field count related session state
         keys_to_clear = [k for k in st.session_state.keys() if 'required' in k.lower() or 'field_count' in k.lower()]
         for key in keys_to_clear:
-            if key in st.session_state:
-                del st.session_state[key]
+            st.session_state.pop(key, None)
         st.session_state.field_counts_cleared = True
     
     # Check for critical backup needs at app startup
@@ -292,30 +343,58 @@ def main():
 
 def show_workflow_summary():
     """Show simplified workflow summary with correct information"""
+    state = st.session_state
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        brokerage_name = st.session_state.get('brokerage_name', 'Not selected')
+        brokerage_name = state.get('brokerage_name', 'Not selected')
         st.info(f"🏢 **Brokerage:** {brokerage_name}")
     
     with col2:
-        api_status = "✅ Connected" if 'api_credentials' in st.session_state else "❌ Not connected"
+        api_status = "✅ Connected" if 'api_credentials' in state else "❌ Not connected"
         st.info(f"🔐 **API Status:** {api_status}")
     
     with col3:
-        file_status = "✅ Uploaded" if 'uploaded_df' in st.session_state else "❌ No file"
+        file_status = "✅ Uploaded" if 'uploaded_df' in state else "❌ No file"
         st.info(f"📂 **File Status:** {file_status}")
 
-def _render_configuration_status(config):
-    """Render enhanced configuration status with visual indicators"""
-    import streamlit as st
+def _has_real_mappings(field_mappings):
+    """True if the mappings contain at least one field, not just '_'-prefixed metadata keys
     
-    # Determine configuration readiness state
+    Stops at the first real key, which for saved configurations is normally the first one.
+    """
+    return any(not key.startswith('_') for key in field_mappings)
+
+# Mapping values that do not name a real column (compared after stripping whitespace)
+_INVALID_MAPPING_VALUES = frozenset({'', 'Select column...'})
+
+def _real_mapping_count(field_mappings):
+    """Number of fields mapped to an actual column (ignores '_' metadata keys and placeholders)"""
+    return sum(
+        1 for key, value in field_mappings.items()
+        if not key.startswith('_') and value and str(value).strip() not in _INVALID_MAPPING_VALUES
+    )
+
+def _compute_readiness(config):
+    """Readiness checks shared by the sidebar status panels, computed once per rerun"""
+    # Read every session value the checks need once, up front
+    state = st.session_state
     field_mappings = config.get('field_mappings', {})
-    has_real_mappings = any(not key.startswith('_') for key in field_mappings.keys())
+    current_mappings = state.get('field_mappings', field_mappings)
+    file_uploaded = 'uploaded_df' in state
+    header_status = state.get('header_comparison', {}).get('status')
+    
+    # Both status panels render in the same rerun; reuse the result unless its inputs changed.
+    # Mappings are keyed on their content, since they are often edited in place
+    signature = (state.get('_rerun_id'), id(config), _mappings_digest(field_mappings),
+                 _mappings_digest(current_mappings), file_uploaded, header_status)
+    cached = state.get('_readiness_cache')
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    has_real_mappings = _has_real_mappings(field_mappings)
     
     # Only consider fields "mapped" if there's a file uploaded and mappings exist
-    file_uploaded = 'uploaded_df' in st.session_state
     fields_actually_mapped = file_uploaded and has_real_mappings
     
     # Fix API connection check to handle both auth types
@@ -326,22 +405,19 @@ def _render_configuration_status(config):
         api_connected = 'api_credentials' in config and config.get('bearer_token')
     
     # Fix headers validation logic - headers can only be validated if file is uploaded
-    headers_validated = (file_uploaded and 
-                        st.session_state.get('header_comparison', {}).get('status') == 'identical')
-    
-    validation_passed = st.session_state.get('validation_passed', False)
+    headers_validated = file_uploaded and header_status == 'identical'
     
-    # Calculate readiness score with real-time mapping progress
-    # Check actual mapping completeness for uploaded files - always check when file is uploaded
+    # Calculate mapping completeness in real-time - always check when file is uploaded
     mapping_complete = False
     mapped_required = 0
     total_required = 0
     
     if file_uploaded:
-        api_schema = get_full_api_schema()
-        current_mappings = st.session_state.get('field_mappings', field_mappings)
-        required_fields = get_dynamic_field_requirements(api_schema, current_mappings)
-        mapped_required = len([f for f in required_fields.keys() if f in current_mappings and current_mappings[f] and current_mappings[f] != 'Select column...'])
+        required_fields = get_dynamic_field_requirements(API_SCHEMA, current_mappings)
+        mapped_required = sum(
+            1 for f in required_fields.keys() & current_mappings.keys()
+            if current_mappings[f] and current_mappings[f] != 'Select column...'
+        )
         total_required = len(required_fields)
         mapping_complete = mapped_required >= total_required and total_required > 0
     
@@ -355,7 +431,35 @@ def _render_configuration_status(config):
     
     ready_count = sum(1 for _, is_ready in readiness_checks if is_ready)
     total_checks = len(readiness_checks)
-    readiness_percentage = (ready_count / total_checks) * 100
+    
+    readiness = {
+        'checks': readiness_checks,
+        'ready_count': ready_count,
+        'total_checks': total_checks,
+        'percentage': (ready_count / total_checks) * 100,
+        'file_uploaded': file_uploaded,
+        'fields_actually_mapped': fields_actually_mapped,
+        'api_connected': api_connected,
+        'mapping_complete': mapping_complete,
+        'mapped_required': mapped_required,
+        'total_required': total_required
+    }
+    state._readiness_cache = (signature, readiness)
+    return readiness
+
+def _render_configuration_status(config):
+    """Render enhanced configuration status with visual indicators"""
+    import streamlit as st
+    
+    # Determine configuration readiness state
+    readiness = _compute_readiness(config)
+    readiness_checks = readiness['checks']
+    ready_count = readiness['ready_count']
+    total_checks = readiness['total_checks']
+    readiness_percentage = readiness['percentage']
+    file_uploaded = readiness['file_uploaded']
+    fields_actually_mapped = readiness['fields_actually_mapped']
+    api_connected = readiness['api_connected']
     
     # Determine overall status
     if readiness_percentage == 100:
@@ -437,11 +541,7 @@ def _render_configuration_status(config):
     else:
         st.error("🔴 API Not Connected ❌")
 
-def show_contextual_information(db_manager):
-    """Compact, polished sidebar with better styling"""
-    
-    # Extremely compact CSS for minimal spacing
-    st.markdown("""
+_SIDEBAR_CSS = """
         <style>
         /* Extremely compact sidebar styling */
         .element-container {
@@ -498,11 +598,46 @@ def show_contextual_information(db_manager):
         .css-1d391kg > div {
             margin-bottom: 0.05rem !important;
         }
+        /* Status guidance pills: size on the wrapper, tone on the pill */
+        .ff-pill {
+            font-weight: 500;
+            background: linear-gradient(135deg, var(--ff-from) 0%, var(--ff-to) 100%);
+            border: 1px solid rgba(var(--ff-rgb), 0.2);
+        }
+        .ff-pill-lg { margin: 8px 0; }
+        .ff-pill-lg .ff-pill {
+            padding: 8px 12px;
+            border-radius: 10px;
+            font-size: 0.9rem;
+            box-shadow: 0 2px 8px rgba(var(--ff-rgb), 0.2);
+            border-color: rgba(var(--ff-rgb), 0.3);
+            text-align: center;
+            letter-spacing: 0.025em;
+        }
+        .ff-pill-md { margin: 6px 0; }
+        .ff-pill-md .ff-pill {
+            padding: 6px 10px;
+            border-radius: 8px;
+            font-size: 0.85rem;
+            box-shadow: 0 2px 6px rgba(var(--ff-rgb), 0.15);
+        }
+        .ff-pill-sm { margin: 4px 0; }
+        .ff-pill-sm .ff-pill {
+            padding: 4px 8px;
+            border-radius: 6px;
+            font-size: 0.75rem;
+            box-shadow: 0 1px 4px rgba(var(--ff-rgb), 0.15);
+        }
+        .ff-pill.ff-center { text-align: center; }
+        .ff-green { --ff-from: #d1fae5; --ff-to: #a7f3d0; --ff-rgb: 16, 185, 129; color: #065f46; }
+        .ff-amber { --ff-from: #fef3c7; --ff-to: #fde68a; --ff-rgb: 245, 158, 11; color: #92400e; }
+        .ff-blue { --ff-from: #dbeafe; --ff-to: #bfdbfe; --ff-rgb: 59, 130, 246; color: #1e40af; }
+        .ff-violet { --ff-from: #ede9fe; --ff-to: #ddd6fe; --ff-rgb: 139, 92, 246; color: #5b21b6; }
+        .ff-gray { --ff-from: #f3f4f6; --ff-to: #e5e7eb; --ff-rgb: 107, 114, 128; color: #374151; }
         </style>
-    """, unsafe_allow_html=True)
-    
-    # Extremely compact header
-    st.markdown("""
+    """
+
+_SIDEBAR_HEADER_HTML = """
         <div style="
             background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
             border-radius: 4px;
@@ -522,7 +657,17 @@ def show_contextual_information(db_manager):
                 ⚙️ Configuration
             </h4>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+def show_contextual_information(db_manager):
+    """Compact, polished sidebar with better styling"""
+    
+    # Extremely compact CSS for minimal spacing. Streamlit drops elements that a rerun
+    # does not emit again, so the markup is re-sent every rerun rather than once per session.
+    st.markdown(_SIDEBAR_CSS, unsafe_allow_html=True)
+    
+    # Extremely compact header
+    st.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
     
     # Extremely compact brokerage section
     selected_brokerage = st.session_state.get('brokerage_name')
@@ -571,6 +716,37 @@ def show_contextual_information(db_manager):
         if st.button("📊 View Analytics", use_container_width=True, key="sidebar_learning_analytics"):
             st.session_state.show_learning_analytics = True
 
+@fragment
+def _render_new_brokerage_form(db_manager):
+    """New-brokerage name input; typing only reruns this form until Create/Cancel triggers a full rerun"""
+    new_brokerage = st.text_input(
+        "New brokerage name",
+        placeholder="Enter brokerage name",
+        key="sidebar_new_brokerage_input"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Create", key="create_brokerage_btn", use_container_width=True):
+            if new_brokerage.strip():
+                # Create brokerage in database
+                if db_manager.create_brokerage(new_brokerage.strip()):
+                    st.session_state.brokerage_name = new_brokerage.strip()
+                    st.session_state.show_new_brokerage_form = False
+                    # Store success message in session state to persist across rerun
+                    st.session_state.brokerage_creation_success = f"✅ Created: {new_brokerage.strip()}"
+                else:
+                    # Store error message in session state to persist across rerun
+                    st.session_state.brokerage_creation_error = "❌ Failed to create brokerage. Please try again."
+            else:
+                # Store error message in session state to persist across rerun
+                st.session_state.brokerage_creation_error = "❌ Please enter a brokerage name"
+            # Full rerun so the sidebar shows the outcome and the main area sees the new brokerage
+            st.rerun()
+    with col2:
+        if st.button("Cancel", key="cancel_brokerage_btn", use_container_width=True):
+            st.session_state.show_new_brokerage_form = False
+            st.rerun()
+
 def _render_brokerage_selection(db_manager):
     """Render compact brokerage selection"""
     
@@ -587,7 +763,7 @@ def _render_brokerage_selection(db_manager):
         st.session_state.brokerage_creation_error_shown = True
     
     try:
-        brokerages = db_manager.get_all_brokerages()
+        brokerages = _cached_brokerages(db_manager, _db_version(db_manager))
         brokerage_options = [b['name'] for b in brokerages] if brokerages else []
     except:
         brokerage_options = []
@@ -613,32 +789,7 @@ def _render_brokerage_selection(db_manager):
             st.session_state.show_new_brokerage_form = True
         
         if st.session_state.get('show_new_brokerage_form'):
-            new_brokerage = st.text_input(
-                "New brokerage name",
-                placeholder="Enter brokerage name",
-                key="sidebar_new_brokerage_input"
-            )
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Create", key="create_brokerage_btn", use_container_width=True):
-                    if new_brokerage.strip():
-                        # Create brokerage in database
-                        if db_manager.create_brokerage(new_brokerage.strip()):
-                            st.session_state.brokerage_name = new_brokerage.strip()
-                            st.session_state.show_new_brokerage_form = False
-                            # Store success message in session state to persist across rerun
-                            st.session_state.brokerage_creation_success = f"✅ Created: {new_brokerage.strip()}"
-                            st.rerun()
-                        else:
-                            # Store error message in session state to persist across rerun
-                            st.session_state.brokerage_creation_error = "❌ Failed to create brokerage. Please try again."
-                    else:
-                        # Store error message in session state to persist across rerun
-                        st.session_state.brokerage_creation_error = "❌ Please enter a brokerage name"
-            with col2:
-                if st.button("Cancel", key="cancel_brokerage_btn", use_container_width=True):
-                    st.session_state.show_new_brokerage_form = False
-                    st.rerun()
+            _render_new_brokerage_form(db_manager)
     else:
         # Direct input for first brokerage
         new_brokerage = st.text_input(
@@ -661,29 +812,23 @@ def _render_brokerage_selection(db_manager):
         
         if current_brokerage != new_brokerage:
             # SECURITY: Aggressively clear all configuration-related state when changing brokerage
-            import logging
             logging.info(f"Brokerage changed from '{current_brokerage}' to '{new_brokerage}' - clearing all configuration state")
             
             # Clear configuration and credentials
-            if 'selected_configuration' in st.session_state:
-                del st.session_state['selected_configuration']
-            if 'api_credentials' in st.session_state:
-                del st.session_state['api_credentials']
-            if 'configuration_type' in st.session_state:
-                del st.session_state['configuration_type']
-            if 'auto_select_config' in st.session_state:
-                del st.session_state['auto_select_config']
+            st.session_state.pop('selected_configuration', None)
+            st.session_state.pop('api_credentials', None)
+            st.session_state.pop('configuration_type', None)
+            st.session_state.pop('auto_select_config', None)
                 
             # Clear all workflow state to prevent cross-contamination
             workflow_keys_to_clear = [
-                'uploaded_df', 'uploaded_file_name', 'file_headers', 'validation_passed', 
+                'uploaded_df', 'uploaded_df_head', 'uploaded_file_name', 'uploaded_file_hash', 'file_headers', 'file_headers_hash', 'validation_passed', 
                 'header_comparison', 'field_mappings', 'mapping_tab_index', 
                 'processing_results', 'load_results', 'processing_in_progress', 
                 'validation_errors', 'mapping_section_expanded', 'processing_completed'
             ]
             for key in workflow_keys_to_clear:
-                if key in st.session_state:
-                    del st.session_state[key]
+                st.session_state.pop(key, None)
             
             st.session_state.brokerage_name = new_brokerage
             
@@ -698,27 +843,23 @@ def _render_brokerage_selection(db_manager):
         if ('brokerage_name' in st.session_state and 
             not st.session_state.get('brokerage_creation_success')):
             del st.session_state['brokerage_name']
-            if 'selected_configuration' in st.session_state:
-                del st.session_state['selected_configuration']
-            if 'api_credentials' in st.session_state:
-                del st.session_state['api_credentials']
+            st.session_state.pop('selected_configuration', None)
+            st.session_state.pop('api_credentials', None)
             st.rerun()
     
     # Clear success/error messages after all processing is done
     if st.session_state.get('brokerage_creation_success_shown'):
-        if 'brokerage_creation_success' in st.session_state:
-            del st.session_state.brokerage_creation_success
+        st.session_state.pop('brokerage_creation_success', None)
         del st.session_state.brokerage_creation_success_shown
     
     if st.session_state.get('brokerage_creation_error_shown'):
-        if 'brokerage_creation_error' in st.session_state:
-            del st.session_state.brokerage_creation_error
+        st.session_state.pop('brokerage_creation_error', None)
         del st.session_state.brokerage_creation_error_shown
 
 def _render_configuration_selection(db_manager, brokerage_name):
     """Render compact configuration selection"""
     try:
-        configurations = db_manager.get_brokerage_configurations(brokerage_name)
+        configurations = _cached_configurations(db_manager, brokerage_name, _db_version(db_manager))
     except:
         configurations = []
     
@@ -751,12 +892,10 @@ def _render_configuration_selection(db_manager, brokerage_name):
             # SECURITY: Validate configuration belongs to current brokerage
             config_brokerage = selected_config.get('brokerage_name', '')
             if config_brokerage != brokerage_name:
-                import logging
                 logging.error(f"SECURITY ALERT: Cross-brokerage configuration access attempt. Config: '{selected_config_display}' belongs to '{config_brokerage}' but current brokerage is '{brokerage_name}'")
                 st.error("⚠️ Security Error: Configuration doesn't belong to selected brokerage. Please refresh the page.")
                 # Clear invalid state
-                if 'selected_configuration' in st.session_state:
-                    del st.session_state['selected_configuration']
+                st.session_state.pop('selected_configuration', None)
                 st.rerun()
                 return
             
@@ -774,10 +913,9 @@ def _render_configuration_selection(db_manager, brokerage_name):
                     pass
                 
                 # Clear workflow state and validation state (preserve field_mappings)
-                keys_to_clear = ['uploaded_df', 'uploaded_file_name', 'file_headers', 'validation_passed', 'header_comparison', 'mapping_tab_index', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded', 'processing_completed']
+                keys_to_clear = ['uploaded_df', 'uploaded_df_head', 'uploaded_file_name', 'uploaded_file_hash', 'file_headers', 'file_headers_hash', 'validation_passed', 'header_comparison', 'mapping_tab_index', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded', 'processing_completed']
                 for key in keys_to_clear:
-                    if key in st.session_state:
-                        del st.session_state[key]
+                    st.session_state.pop(key, None)
                 
                 # Intelligently update field_mappings from selected configuration
                 if selected_config and selected_config.get('field_mappings'):
@@ -858,56 +996,34 @@ def _render_compact_brokerage_config_display(db_manager, brokerage_name, configu
         st.markdown("**Change Configuration:**")
         _render_configuration_selection(db_manager, brokerage_name)
 
+def _render_status_pill(text, tone, size, centered=False):
+    """Render a sidebar guidance pill using the ff-pill classes from _SIDEBAR_CSS"""
+    center = ' ff-center' if centered else ''
+    st.markdown(
+        f'<div class="ff-pill-{size}"><div class="ff-pill ff-{tone}{center}">{text}</div></div>',
+        unsafe_allow_html=True
+    )
+
 def _render_consolidated_status():
     """Render compact, polished status information"""
-    config = st.session_state.get('selected_configuration', {})
+    state = st.session_state
+    config = state.get('selected_configuration', {})
     
     # Calculate readiness
-    field_mappings = config.get('field_mappings', {})
-    has_real_mappings = any(not key.startswith('_') for key in field_mappings.keys())
-    
-    # Only consider fields "mapped" if there's a file uploaded and mappings exist
-    file_uploaded = 'uploaded_df' in st.session_state
-    fields_actually_mapped = file_uploaded and has_real_mappings
-    
-    # Fix API connection check to handle both auth types
-    auth_type = config.get('auth_type', 'api_key')
-    if auth_type == 'api_key':
-        api_connected = 'api_credentials' in config and config['api_credentials'].get('api_key')
-    else:  # bearer_token
-        api_connected = 'api_credentials' in config and config.get('bearer_token')
-    
-    # Fix headers validation logic - headers can only be validated if file is uploaded
-    headers_validated = (file_uploaded and 
-                        st.session_state.get('header_comparison', {}).get('status') == 'identical')
-    
-    validation_passed = st.session_state.get('validation_passed', False)
-    processing_completed = st.session_state.get('processing_completed', False)
-    
-    # Calculate mapping completeness in real-time - always check when file is uploaded
-    mapping_complete = False
-    mapped_required = 0
-    total_required = 0
-    
-    if file_uploaded:
-        api_schema = get_full_api_schema()
-        current_mappings = st.session_state.get('field_mappings', field_mappings)
-        required_fields = get_dynamic_field_requirements(api_schema, current_mappings)
-        mapped_required = len([f for f in required_fields.keys() if f in current_mappings and current_mappings[f] and current_mappings[f] != 'Select column...'])
-        total_required = len(required_fields)
-        mapping_complete = mapped_required >= total_required and total_required > 0
-    
-    readiness_checks = [
-        ('API Connected', api_connected),
-        ('Fields Mapped', fields_actually_mapped),
-        ('File Uploaded', file_uploaded),
-        ('Headers Validated', headers_validated or (not fields_actually_mapped and not file_uploaded)),
-        ('Mapping Ready', mapping_complete)  # All required fields actually mapped
-    ]
-    
-    ready_count = sum(1 for _, is_ready in readiness_checks if is_ready)
-    total_checks = len(readiness_checks)
-    readiness_percentage = (ready_count / total_checks) * 100
+    readiness = _compute_readiness(config)
+    readiness_checks = readiness['checks']
+    ready_count = readiness['ready_count']
+    total_checks = readiness['total_checks']
+    readiness_percentage = readiness['percentage']
+    file_uploaded = readiness['file_uploaded']
+    fields_actually_mapped = readiness['fields_actually_mapped']
+    api_connected = readiness['api_connected']
+    mapping_complete = readiness['mapping_complete']
+    mapped_required = readiness['mapped_required']
+    total_required = readiness['total_required']
+    
+    validation_passed = state.get('validation_passed', False)
+    processing_completed = state.get('processing_completed', False)
     
     # Override status if processing is completed
     if processing_completed:
@@ -1006,104 +1122,21 @@ def _render_consolidated_status():
         </div>
     """, unsafe_allow_html=True)
     
-    # Modern guidance messaging with enhanced styling
+    # Modern guidance messaging; pill styling lives in _SIDEBAR_CSS
     if processing_completed:
-        st.markdown('''
-            <div style="margin: 8px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%);
-                    color: #065f46; 
-                    padding: 6px 10px; 
-                    border-radius: 8px; 
-                    font-size: 0.85rem;
-                    font-weight: 500;
-                    box-shadow: 0 2px 6px rgba(16, 185, 129, 0.15);
-                    border: 1px solid rgba(16, 185, 129, 0.2);
-                    text-align: center;
-                ">✅ Complete</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill("✅ Complete", 'green', 'md', centered=True)
     elif file_uploaded and total_required > 0 and not mapping_complete:
         # Show mapping progress message
-        st.markdown(f'''
-            <div style="margin: 8px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
-                    color: #92400e; 
-                    padding: 8px 12px; 
-                    border-radius: 10px; 
-                    font-size: 0.9rem;
-                    font-weight: 500;
-                    box-shadow: 0 2px 8px rgba(245, 158, 11, 0.2);
-                    border: 1px solid rgba(245, 158, 11, 0.3);
-                    text-align: center;
-                    letter-spacing: 0.025em;
-                ">📋 Map {total_required - mapped_required} more fields</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill(f"📋 Map {total_required - mapped_required} more fields", 'amber', 'lg')
     elif readiness_percentage == 100:
-        st.markdown('''
-            <div style="margin: 8px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%);
-                    color: #065f46; 
-                    padding: 8px 12px; 
-                    border-radius: 10px; 
-                    font-size: 0.9rem;
-                    font-weight: 500;
-                    box-shadow: 0 2px 8px rgba(16, 185, 129, 0.2);
-                    border: 1px solid rgba(16, 185, 129, 0.3);
-                    text-align: center;
-                    letter-spacing: 0.025em;
-                ">🚀 Ready to process!</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill("🚀 Ready to process!", 'green', 'lg')
     elif readiness_percentage >= 80:
         if not file_uploaded:
-            st.markdown('''
-                <div style="margin: 6px 0;">
-                    <div style="
-                        background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
-                        color: #1e40af; 
-                        padding: 6px 10px; 
-                        border-radius: 8px; 
-                        font-size: 0.85rem;
-                        font-weight: 500;
-                        box-shadow: 0 2px 6px rgba(59, 130, 246, 0.15);
-                        border: 1px solid rgba(59, 130, 246, 0.2);
-                    ">💡 Upload a file to continue</div>
-                </div>
-            ''', unsafe_allow_html=True)
+            _render_status_pill("💡 Upload a file to continue", 'blue', 'md')
         elif not validation_passed:
-            st.markdown('''
-                <div style="margin: 6px 0;">
-                    <div style="
-                        background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
-                        color: #1e40af; 
-                        padding: 6px 10px; 
-                        border-radius: 8px; 
-                        font-size: 0.85rem;
-                        font-weight: 500;
-                        box-shadow: 0 2px 6px rgba(59, 130, 246, 0.15);
-                        border: 1px solid rgba(59, 130, 246, 0.2);
-                    ">💡 Validate data quality</div>
-                </div>
-            ''', unsafe_allow_html=True)
+            _render_status_pill("💡 Validate data quality", 'blue', 'md')
         else:
-            st.markdown('''
-                <div style="margin: 6px 0;">
-                    <div style="
-                        background: linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%);
-                        color: #065f46; 
-                        padding: 6px 10px; 
-                        border-radius: 8px; 
-                        font-size: 0.85rem;
-                        font-weight: 500;
-                        box-shadow: 0 2px 6px rgba(16, 185, 129, 0.15);
-                        border: 1px solid rgba(16, 185, 129, 0.2);
-                    ">🎯 Almost ready!</div>
-                </div>
-            ''', unsafe_allow_html=True)
+            _render_status_pill("🎯 Almost ready!", 'green', 'md')
     elif readiness_percentage >= 60:
         missing_items = []
         if not api_connected:
@@ -1112,64 +1145,33 @@ def _render_consolidated_status():
             missing_items.append("field mappings")
         if not file_uploaded:
             missing_items.append("file upload")
-        st.markdown(f'''
-            <div style="margin: 4px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
-                    color: #92400e; 
-                    padding: 4px 8px; 
-                    border-radius: 6px; 
-                    font-size: 0.75rem;
-                    font-weight: 500;
-                    box-shadow: 0 1px 4px rgba(245, 158, 11, 0.15);
-                    border: 1px solid rgba(245, 158, 11, 0.2);
-                ">⚡ Missing: {", ".join(missing_items)}</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill(f"⚡ Missing: {', '.join(missing_items)}", 'amber', 'sm')
     elif readiness_percentage >= 40:
-        st.markdown('''
-            <div style="margin: 4px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #ede9fe 0%, #ddd6fe 100%);
-                    color: #5b21b6; 
-                    padding: 4px 8px; 
-                    border-radius: 6px; 
-                    font-size: 0.75rem;
-                    font-weight: 500;
-                    box-shadow: 0 1px 4px rgba(139, 92, 246, 0.15);
-                    border: 1px solid rgba(139, 92, 246, 0.2);
-                ">📈 Making progress</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill("📈 Making progress", 'violet', 'sm')
     else:
-        st.markdown('''
-            <div style="margin: 4px 0;">
-                <div style="
-                    background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%);
-                    color: #374151; 
-                    padding: 4px 8px; 
-                    border-radius: 6px; 
-                    font-size: 0.75rem;
-                    font-weight: 500;
-                    box-shadow: 0 1px 4px rgba(107, 114, 128, 0.15);
-                    border: 1px solid rgba(107, 114, 128, 0.2);
-                ">⚙️ Start by connecting API</div>
-            </div>
-        ''', unsafe_allow_html=True)
+        _render_status_pill("⚙️ Start by connecting API", 'gray', 'sm')
     
     # Compact details
     with st.expander("📋 Status Details"):
-        for name, is_ready in readiness_checks:
-            icon = "✅" if is_ready else "⏳"
-            st.caption(f"{icon} {name}")
+        lines = [f"{'✅' if is_ready else '⏳'} {name}" for name, is_ready in readiness_checks]
         
         if processing_completed:
-            st.caption("✅ Processing Completed")
+            lines.append("✅ Processing Completed")
         
         if config.get('created_at'):
-            st.caption(f"📅 Created: {config['created_at'][:10]}")
+            lines.append(f"📅 Created: {config['created_at'][:10]}")
         if config.get('field_count', 0) > 0:
-            st.caption(f"🔗 Fields: {config['field_count']}")
+            lines.append(f"🔗 Fields: {config['field_count']}")
+        
+        # One caption with markdown line breaks instead of one element per line
+        st.caption('  \n'.join(lines))
+
+# Workflow state dropped by the sidebar Reset and "Process Another File" actions
+_RESET_KEYS = (
+    'uploaded_df', 'uploaded_df_head', 'uploaded_file_name', 'uploaded_file_hash', 'field_mappings', 'file_headers', 'file_headers_hash',
+    'validation_passed', 'header_comparison', 'mapping_tab_index', 'processing_results', 'load_results',
+    'processing_in_progress', 'validation_errors', 'mapping_section_expanded', 'processing_completed'
+)
 
 def _render_smart_actions():
     """Render clean, functional action buttons"""
@@ -1197,16 +1199,13 @@ def _render_smart_actions():
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 Reset", key="reset_action", use_container_width=True):
-            keys_to_clear = ['uploaded_df', 'uploaded_file_name', 'field_mappings', 'file_headers', 'validation_passed', 'header_comparison', 'mapping_tab_index', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded', 'processing_completed']
-            for key in keys_to_clear:
-                if key in st.session_state:
-                    del st.session_state[key]
+            for key in _RESET_KEYS:
+                st.session_state.pop(key, None)
             st.rerun()
     
     with col2:
         if st.button("🗑️ Clear All", key="clear_all_action", use_container_width=True):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            st.session_state.clear()
             st.rerun()
 
 def _render_advanced_info(db_manager):
@@ -1218,8 +1217,9 @@ def _render_advanced_info(db_manager):
     
     # Simple metrics
     try:
-        configurations = db_manager.get_brokerage_configurations(brokerage_name)
-        recent_uploads = db_manager.get_brokerage_upload_history(brokerage_name, limit=5)
+        db_version = _db_version(db_manager)
+        configurations = _cached_configurations(db_manager, brokerage_name, db_version)
+        recent_uploads = _cached_recent_uploads(db_manager, brokerage_name, 5, db_version)
         
         col1, col2 = st.columns(2)
         with col1:
@@ -1231,10 +1231,10 @@ def _render_advanced_info(db_manager):
         if recent_uploads:
             st.markdown("**Recent Activity:**")
             for upload in recent_uploads[:3]:
-                success_rate = (upload[5] / upload[4] * 100) if upload[4] > 0 else 0
+                success_rate = upload['success_rate']
                 icon = "✅" if success_rate > 90 else "⚠️" if success_rate > 50 else "❌"
-                date_str = upload[11][:10] if len(upload) > 11 else "Unknown"
-                st.caption(f"{icon} {upload[4]} records • {success_rate:.1f}% success • {date_str}")
+                date_str = (upload['upload_timestamp'] or 'Unknown')[:10]
+                st.caption(f"{icon} {upload['total_records'] or 0} records • {success_rate:.1f}% success • {date_str}")
         
     except Exception as e:
         st.error("Unable to load analytics data")
@@ -1263,8 +1263,7 @@ def _render_session_details():
         details.append("⏳ Pending Validation")
     
     if details:
-        for detail in details:
-            st.caption(detail)
+        st.caption('  \n'.join(details))
     else:
         st.info("No active session data")
 
@@ -1369,18 +1368,21 @@ def _render_new_configuration_form(brokerage_name, db_manager):
     
     # Clear success/error messages after all processing is done
     if st.session_state.get('config_save_success_shown'):
-        if 'config_save_success' in st.session_state:
-            del st.session_state.config_save_success
+        st.session_state.pop('config_save_success', None)
         del st.session_state.config_save_success_shown
     
     if st.session_state.get('config_save_error_shown'):
-        if 'config_save_error' in st.session_state:
-            del st.session_state.config_save_error
+        st.session_state.pop('config_save_error', None)
         del st.session_state.config_save_error_shown
 
+# Session keys whose presence means there is session data worth showing
+_SESSION_DATA_KEYS = ('brokerage_name', 'selected_configuration', 'uploaded_df', 'field_mappings')
+
 def _has_session_data():
     """Check if there's relevant session data to show"""
-    return any(st.session_state.get(key) is not None for key in ['brokerage_name', 'selected_configuration', 'uploaded_df', 'field_mappings'])
+    state = st.session_state
+    # Membership test first: .get() on a missing key goes through a KeyError in the proxy
+    return any(key in state and state[key] is not None for key in _SESSION_DATA_KEYS)
 
 def _handle_save_configuration(brokerage_name, db_manager):
     """Handle saving new configuration"""
@@ -1457,6 +1459,7 @@ def _handle_save_configuration(brokerage_name, db_manager):
                         auth_type=auth_type,
                         bearer_token=save_bearer_token
                     )
+                    _invalidate_db_stats()
                     
                     # Save configuration info to session and switch to 'existing' mode
                     saved_config = {
@@ -1484,8 +1487,7 @@ def _handle_save_configuration(brokerage_name, db_manager):
                     st.session_state.auto_select_config = config_name
                     
                     # Clear new configuration since it's now saved
-                    if 'new_configuration' in st.session_state:
-                        del st.session_state['new_configuration']
+                    st.session_state.pop('new_configuration', None)
                     
                     # Clear the form state
                     st.session_state.config_form_state = {
@@ -1500,8 +1502,9 @@ def _handle_save_configuration(brokerage_name, db_manager):
                     # Store success message in session state to persist across rerun
                     st.session_state.config_save_success = "✅ Configuration saved! Upload a file to continue."
                     
-                    # Trigger backup suggestion after configuration creation
-                    auto_backup_suggestion()
+                    # Defer the backup suggestion to the next run; anything shown
+                    # here would be discarded by the rerun below
+                    st.session_state._pending_backup_check = True
                     
                     st.rerun()
                     
@@ -1527,6 +1530,12 @@ def main_workflow(db_manager, data_processor):
     
     brokerage_name = st.session_state.brokerage_name
     
+    # Show any backup suggestion deferred from the previous run, and keep showing it
+    # while a requested quick backup is waiting to be downloaded
+    if (st.session_state.pop('_pending_backup_check', False) or
+            st.session_state.get('_quick_backup_requested')):
+        auto_backup_suggestion()
+    
     # === PROGRESSIVE DISCLOSURE LANDING PAGE ===
     # Only show what's needed at each step
     
@@ -1542,14 +1551,7 @@ def main_workflow(db_manager, data_processor):
         # Show progress and workflow sections after file upload
         _render_workflow_with_progress(db_manager, data_processor)
 
-def _render_landing_page():
-    """Clean landing page focused on file upload"""
-    
-    # Large, prominent upload area
-    _render_enhanced_file_upload()
-    
-    # Simple benefits section
-    st.markdown("""
+_LANDING_BENEFITS_HTML = """
         <div style="
             display: flex;
             justify-content: space-around;
@@ -1575,23 +1577,9 @@ def _render_landing_page():
                 <div style="font-size: 0.9rem; color: #64748b;">Instant API calls</div>
             </div>
         </div>
-    """, unsafe_allow_html=True)
+    """
 
-def _render_enhanced_file_upload():
-    """Clean file upload area without unnecessary containers"""
-    
-    uploaded_file = st.file_uploader(
-        "Choose your file",
-        type=['csv', 'xlsx', 'xls'],
-        key="main_file_uploader",
-        help="Maximum size: 200MB • Supported formats: CSV, Excel (.xlsx, .xls)"
-    )
-    
-    if uploaded_file:
-        _process_uploaded_file(uploaded_file)
-    
-    # File format indicators
-    st.markdown("""
+_FILE_FORMATS_HTML = """
         <div style="
             text-align: center;
             margin: 1rem 0;
@@ -1622,31 +1610,131 @@ def _render_enhanced_file_upload():
                 ">📈 XLSX</span>
             </div>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+def _render_landing_page():
+    """Clean landing page focused on file upload"""
+    
+    # Large, prominent upload area
+    _render_enhanced_file_upload()
+    
+    # Simple benefits section
+    st.markdown(_LANDING_BENEFITS_HTML, unsafe_allow_html=True)
+
+def _render_enhanced_file_upload():
+    """Clean file upload area without unnecessary containers"""
+    
+    uploaded_file = st.file_uploader(
+        "Choose your file",
+        type=['csv', 'xlsx', 'xls'],
+        key="main_file_uploader",
+        help="Maximum size: 200MB • Supported formats: CSV, Excel (.xlsx, .xls)"
+    )
+    
+    if uploaded_file:
+        _process_uploaded_file(uploaded_file)
+    
+    # File format indicators
+    st.markdown(_FILE_FORMATS_HTML, unsafe_allow_html=True)
+
+def _read_csv_with_pyarrow(file_obj):
+    """Multithreaded pyarrow CSV parse that matches pd.read_csv's default output
+    
+    pyarrow infers dates and timestamps, which would replace the original text of
+    those cells with Timestamp values; such columns are re-read as plain strings.
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    # Empty fields are missing values, as with pd.read_csv
+    table = pa_csv.read_csv(file_obj, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+    # pd.read_csv renames blank and repeated headers ("Unnamed: 1", "name.1"); leave those
+    # files to the default parser
+    if '' in table.column_names or len(set(table.column_names)) != len(table.column_names):
+        raise ValueError("blank or duplicate column names")
+    
+    text_columns = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+    if text_columns:
+        file_obj.seek(0)
+        text_table = pa_csv.read_csv(file_obj, convert_options=pa_csv.ConvertOptions(
+            strings_can_be_null=True,
+            include_columns=text_columns,
+            column_types={name: pa.string() for name in text_columns}
+        ))
+        for name in text_columns:
+            table = table.set_column(table.schema.get_field_index(name), name, text_table.column(name))
+    
+    # All-empty columns have pyarrow's null type; pd.read_csv gives float NaN columns
+    table = table.cast(pa.schema([
+        pa.field(field.name, pa.float64()) if pa.types.is_null(field.type) else field
+        for field in table.schema
+    ]))
+    df = table.to_pandas()
+    
+    # Before pandas 3, missing strings convert to None where pd.read_csv gives NaN
+    object_columns = df.columns[df.dtypes == object]
+    if len(object_columns):
+        df[object_columns] = df[object_columns].where(df[object_columns].notna(), float('nan'))
+    return df
+
+def _read_uploaded_file(file_name, file_obj):
+    """Parse an uploaded CSV or Excel file into a DataFrame"""
+    if file_name.endswith('.csv'):
+        if PYARROW_AVAILABLE:
+            try:
+                return _read_csv_with_pyarrow(file_obj)
+            except Exception as e:
+                # Fall back to the default C parser for inputs pyarrow rejects
+                logger.warning(f"pyarrow CSV parsing failed, retrying with default engine: {str(e)}")
+                file_obj.seek(0)
+        return pd.read_csv(file_obj)
+    if CALAMINE_AVAILABLE:
+        try:
+            return pd.read_excel(file_obj, engine='calamine')
+        except Exception as e:
+            # Older pandas has no calamine engine; fall back to the default readers
+            logger.warning(f"calamine Excel parsing failed, retrying with default engine: {str(e)}")
+            file_obj.seek(0)
+    if file_name.endswith('.xlsx'):
+        # Skip engine detection; pandas already opens openpyxl workbooks read-only
+        return pd.read_excel(file_obj, engine='openpyxl')
+    return pd.read_excel(file_obj)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _parse_uploaded_bytes(file_name, content_hash, _data):
+    """Parsed, header-normalized DataFrame for an upload, keyed on its name and content hash"""
+    return normalize_column_names(_read_uploaded_file(file_name, io.BytesIO(_data)))
 
 def _process_uploaded_file(uploaded_file):
     """Process the uploaded file and update session state"""
     try:
+        data = uploaded_file.getvalue()
+        content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if (content_hash == st.session_state.get('uploaded_file_hash') and
+                st.session_state.get('uploaded_df') is not None):
+            # Same bytes as the file already loaded; keep the current workflow state
+            return
+        
         # Clear processing state from previous session and validation state
         keys_to_clear = ['processing_completed', 'validation_passed', 'field_mappings', 'header_comparison', 'mapping_tab_index', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded']
         for key in keys_to_clear:
-            if key in st.session_state:
-                del st.session_state[key]
+            st.session_state.pop(key, None)
         
         # Process file upload
+        # Parse and normalize; re-uploading the same file is served from the cache
         with st.spinner("📖 Reading file..."):
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_excel(uploaded_file)
+            df = _parse_uploaded_bytes(uploaded_file.name, content_hash, data)
         
-        # Normalize and store
-        df = normalize_column_names(df)
+        # Store
         file_headers = list(df.columns)
         
         st.session_state.uploaded_df = df
+        # Preview rows, sliced once here rather than on every preview render
+        st.session_state.uploaded_df_head = df.head(10).copy()
         st.session_state.uploaded_file_name = uploaded_file.name
+        st.session_state.uploaded_file_hash = content_hash
         st.session_state.file_headers = file_headers
+        st.session_state.file_headers_hash = _headers_digest(file_headers)
         st.session_state.file_size = uploaded_file.size / 1024 / 1024  # MB
         
         # Header validation with existing config
@@ -1661,6 +1749,10 @@ def _process_uploaded_file(uploaded_file):
     except Exception as e:
         st.error(f"❌ Error reading file: {str(e)}")
 
+def _headers_digest(headers):
+    """Short digest of an ordered header list (unit separator, since headers may contain commas)"""
+    return hashlib.blake2b('\x1f'.join(map(str, headers)).encode(), digest_size=8).hexdigest()
+
 def _validate_headers_with_config(file_headers):
     """Validate file headers against existing configuration"""
     brokerage_name = st.session_state.brokerage_name
@@ -1672,13 +1764,27 @@ def _validate_headers_with_config(file_headers):
         # Always try to validate headers against saved config in database
         # Don't rely on session state mappings which might be placeholders
         from src.frontend.ui_components import create_header_validation_interface
-        from src.backend.database import DatabaseManager
-        db_manager = DatabaseManager()
+        db_manager = _get_db_manager()
         
         # Get the actual saved configuration from database
         saved_config = db_manager.get_brokerage_configuration(brokerage_name, config['name'])
         
         if saved_config and saved_config.get('file_headers'):
+            saved_headers = saved_config['file_headers']
+            headers_hash = st.session_state.get('file_headers_hash') or _headers_digest(file_headers)
+            if _headers_digest(saved_headers) == headers_hash:
+                # Same headers in the same order: identical without the full set comparison.
+                # Render what create_header_validation_interface shows for an identical match
+                st.markdown("#### File Header Validation")
+                st.session_state.header_comparison = {
+                    'status': 'identical',
+                    'missing': [],
+                    'added': [],
+                    'common': list(file_headers),
+                    'changes': []
+                }
+                return
+            
             # Compare headers with saved configuration
             header_comparison = create_header_validation_interface(
                 file_headers, db_manager, brokerage_name, config['name']
@@ -1701,50 +1807,62 @@ def _validate_headers_with_config(file_headers):
             'added': file_headers
         }
 
+@dataclass(frozen=True)
+class WorkflowState:
+    """Snapshot of the workflow inputs read once at the start of a render"""
+    step: int
+    has_file: bool
+    has_mappings: bool
+    has_real_mappings: bool
+    validated: bool
+
+def _read_workflow_state():
+    """Read the workflow session keys once and derive the current progress step"""
+    state = st.session_state
+    has_file = state.get('uploaded_df') is not None
+    field_mappings = state.get('field_mappings')
+    # Count mapped fields once; both the status hint and the step indicator use it
+    has_real_mappings = _real_mapping_count(field_mappings or {}) > 0
+    validated = state.get('validation_passed') == True
+    
+    if validated:
+        step = 4
+    elif has_file and 'field_mappings' in state:
+        step = 3 if has_real_mappings else 2
+    elif has_file:
+        step = 2
+    else:
+        step = 1
+    
+    return WorkflowState(
+        step=step,
+        has_file=has_file,
+        has_mappings=bool(field_mappings),
+        has_real_mappings=has_real_mappings,
+        validated=validated
+    )
+
 def _render_workflow_with_progress(db_manager, data_processor):
     """Show workflow sections with progress bar after file upload"""
     
+    workflow = _read_workflow_state()
+    
     # Show compact status info based on current state
-    if st.session_state.get('uploaded_df') is not None and not st.session_state.get('validation_passed'):
-        if st.session_state.get('field_mappings'):
-            # Check if we have real mappings
-            field_mappings = st.session_state.get('field_mappings', {})
-            has_real_mappings = any(not k.startswith('_') and v and v != 'Select column...' for k, v in field_mappings.items())
-            if has_real_mappings:
-                st.info("🔍 Mapping complete! Ready to validate data quality")
-            else:
-                st.info("🔗 Complete field mapping to continue")
-    
-    # Determine current step based on session state
-    if st.session_state.get('validation_passed') == True:
-        current_step = 4
-    elif (st.session_state.get('uploaded_df') is not None and 
-          'field_mappings' in st.session_state):
-        field_mappings = st.session_state.get('field_mappings', {})
-        has_real_mappings = any(
-            not key.startswith('_') and 
-            value and 
-            value != 'Select column...' and 
-            value.strip() != ''
-            for key, value in field_mappings.items()
-        )
-        if has_real_mappings:
-            current_step = 3
+    if workflow.has_file and not workflow.validated and workflow.has_mappings:
+        if workflow.has_real_mappings:
+            st.info("🔍 Mapping complete! Ready to validate data quality")
         else:
-            current_step = 2
-    elif st.session_state.get('uploaded_df') is not None:
-        current_step = 2
-    else:
-        current_step = 1
+            st.info("🔗 Complete field mapping to continue")
     
     # Show progress bar
-    _render_enhanced_progress(current_step)
+    _render_enhanced_progress(workflow.step)
     
     # Show current file info
     _render_current_file_info()
     
-    # Progressive disclosure sections
-    if st.session_state.get('uploaded_df') is not None:
+    # Progressive disclosure sections. Later gates re-read session state because
+    # the sections above can update mappings and validation within this run.
+    if workflow.has_file:
         _render_smart_mapping_section(db_manager, data_processor)
     
     if st.session_state.get('field_mappings'):
@@ -1768,8 +1886,13 @@ def _render_workflow_with_progress(db_manager, data_processor):
             st.session_state.show_learning_analytics = False
             st.rerun()
 
+@fragment
 def _render_current_file_info():
-    """Show current file information in a compact format"""
+    """Show current file information in a compact format
+    
+    Runs as a fragment so the Preview toggle only reruns this panel; changing the
+    file clears workflow state and reruns the whole app.
+    """
     if st.session_state.get('uploaded_df') is not None:
         filename = st.session_state.get('uploaded_file_name', 'Unknown')
         record_count = len(st.session_state.uploaded_df)
@@ -1801,10 +1924,9 @@ def _render_current_file_info():
         with col1:
             if st.button("📂 Upload Different File", key="change_file_btn", use_container_width=True):
                 # Clear file-related state and validation state
-                keys_to_clear = ['uploaded_df', 'uploaded_file_name', 'file_headers', 'validation_passed', 'header_comparison', 'field_mappings', 'mapping_tab_index', 'file_size', 'processing_completed', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded']
+                keys_to_clear = ['uploaded_df', 'uploaded_df_head', 'uploaded_file_name', 'uploaded_file_hash', 'file_headers', 'file_headers_hash', 'validation_passed', 'header_comparison', 'field_mappings', 'mapping_tab_index', 'file_size', 'processing_completed', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded']
                 for key in keys_to_clear:
-                    if key in st.session_state:
-                        del st.session_state[key]
+                    st.session_state.pop(key, None)
                 st.rerun()
         
         with col2:
@@ -1819,7 +1941,10 @@ def _render_current_file_info():
                 
                 with preview_tab1:
                     st.caption("Raw CSV data (first 10 rows)")
-                    st.dataframe(st.session_state.uploaded_df.head(10), use_container_width=True)
+                    preview_df = st.session_state.get('uploaded_df_head')
+                    if preview_df is None:
+                        preview_df = st.session_state.uploaded_df.head(10)
+                    st.dataframe(preview_df, use_container_width=True)
                 
                 with preview_tab2:
                     st.caption("Sample API payload generated from first row of your CSV data")
@@ -1827,11 +1952,9 @@ def _render_current_file_info():
                     # Get field mappings and data processor
                     field_mappings = st.session_state.get('field_mappings', {})
                     
-                    # Import data processor dynamically to avoid circular imports
-                    from src.backend.data_processor import DataProcessor
                     from src.frontend.ui_components import generate_sample_api_preview
                     
-                    data_processor = DataProcessor()
+                    data_processor = _get_data_processor()
                     
                     # Generate API preview
                     api_preview_data = generate_sample_api_preview(
@@ -1872,7 +1995,7 @@ def _render_current_file_info():
                             with col1:
                                 st.metric("Mapped Fields", len(api_preview_data['mapped_fields']))
                             with col2:
-                                dynamic_required_fields = get_dynamic_field_requirements(get_full_api_schema(), field_mappings)
+                                dynamic_required_fields = get_dynamic_field_requirements(API_SCHEMA, field_mappings)
                                 required_fields = [f for f in api_preview_data['mapped_fields'] if f in dynamic_required_fields]
                                 st.metric("Required Fields", len(required_fields))
                             with col3:
@@ -1935,6 +2058,35 @@ def _render_current_file_info():
                     else:
                         st.info("No field mappings configured yet. Complete the mapping step to see details.")
 
+# Per-state markup for the workflow progress steps, filled with the step icon and label.
+# Kept on single lines: the steps are joined into one markdown call, where indented
+# continuation lines would be read as code blocks.
+_PROGRESS_STEP_HTML = {
+    'completed': (
+        '<div style="flex: 1; text-align: center; color: #059669;">'
+        '<div style="font-size: 1.2rem; margin-bottom: 0.25rem;">✅</div>'
+        '<div style="font-size: 0.65rem; font-weight: 600; line-height: 1;">{label}</div>'
+        '</div>'
+    ),
+    'active': (
+        '<div style="flex: 1; text-align: center; color: #2563eb;">'
+        '<div style="font-size: 1.2rem; margin-bottom: 0.25rem; animation: pulse 2s infinite;">{icon}</div>'
+        '<div style="font-size: 0.65rem; font-weight: 600; color: #2563eb; line-height: 1;">{label}</div>'
+        '</div>'
+    ),
+    'pending': (
+        '<div style="flex: 1; text-align: center; color: #9ca3af;">'
+        '<div style="font-size: 1.2rem; margin-bottom: 0.25rem; opacity: 0.5;">{icon}</div>'
+        '<div style="font-size: 0.65rem; line-height: 1;">{label}</div>'
+        '</div>'
+    )
+}
+
+_PROGRESS_CONTAINER_HTML = (
+    '<div style="display: flex; background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%); '
+    'border-radius: 0.5rem; padding: 0.5rem; margin: 0.5rem 0; border: 1px solid #e2e8f0;">{steps}</div>'
+)
+
 def _render_enhanced_progress(current_step):
     """Enhanced progress bar with visual connections and animations"""
     steps = [
@@ -1944,45 +2096,18 @@ def _render_enhanced_progress(current_step):
         {"num": 4, "label": "Process", "icon": "🚀"}
     ]
     
-    st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-            border-radius: 0.5rem;
-            padding: 0.5rem;
-            margin: 0.5rem 0;
-            border: 1px solid #e2e8f0;
-        ">
-    """, unsafe_allow_html=True)
-    
-    cols = st.columns(len(steps))
-    for i, step in enumerate(steps):
-        with cols[i]:
-            is_active = step["num"] == current_step
-            is_completed = step["num"] < current_step
-            
-            if is_completed:
-                st.markdown(f"""
-                    <div style="text-align: center; color: #059669;">
-                        <div style="font-size: 1.2rem; margin-bottom: 0.25rem;">✅</div>
-                        <div style="font-size: 0.65rem; font-weight: 600; line-height: 1;">{step["label"]}</div>
-                    </div>
-                """, unsafe_allow_html=True)
-            elif is_active:
-                st.markdown(f"""
-                    <div style="text-align: center; color: #2563eb;">
-                        <div style="font-size: 1.2rem; margin-bottom: 0.25rem; animation: pulse 2s infinite;">{step["icon"]}</div>
-                        <div style="font-size: 0.65rem; font-weight: 600; color: #2563eb; line-height: 1;">{step["label"]}</div>
-                    </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                    <div style="text-align: center; color: #9ca3af;">
-                        <div style="font-size: 1.2rem; margin-bottom: 0.25rem; opacity: 0.5;">{step["icon"]}</div>
-                        <div style="font-size: 0.65rem; line-height: 1;">{step["label"]}</div>
-                    </div>
-                """, unsafe_allow_html=True)
+    # Build all four steps into one flex row and send it as a single element
+    step_html = []
+    for step in steps:
+        if step["num"] < current_step:
+            template = _PROGRESS_STEP_HTML['completed']
+        elif step["num"] == current_step:
+            template = _PROGRESS_STEP_HTML['active']
+        else:
+            template = _PROGRESS_STEP_HTML['pending']
+        step_html.append(template.format(icon=step["icon"], label=step["label"]))
     
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_PROGRESS_CONTAINER_HTML.format(steps=''.join(step_html)), unsafe_allow_html=True)
 
 def _render_smart_mapping_section(db_manager, data_processor):
     """Smart mapping section with progressive disclosure"""
@@ -2011,7 +2136,7 @@ def _render_smart_mapping_section(db_manager, data_processor):
             'selected_configuration' in st.session_state):
             config = st.session_state.selected_configuration
             field_mappings = config.get('field_mappings', {})
-            has_real_mappings = any(not key.startswith('_') for key in field_mappings.keys())
+            has_real_mappings = _has_real_mappings(field_mappings)
             
             if has_real_mappings:
                 existing_config = config
@@ -2034,7 +2159,7 @@ def _render_smart_mapping_section(db_manager, data_processor):
             st.session_state.get('file_headers')):
             
             # Check if mappings have real content (not just placeholders)
-            has_real_mappings = any(not key.startswith('_') for key in field_mappings.keys())
+            has_real_mappings = _has_real_mappings(field_mappings)
             
             if has_real_mappings:
                 # Save mappings to database immediately
@@ -2054,9 +2179,8 @@ def _render_smart_mapping_section(db_manager, data_processor):
                 st.caption("📝 Complete field mapping to save configuration")
         
         # Progress indicator
-        api_schema = get_full_api_schema()
-        required_fields = get_dynamic_field_requirements(api_schema, field_mappings)
-        mapped_required = len([f for f in required_fields.keys() if f in field_mappings])
+        required_fields = get_dynamic_field_requirements(API_SCHEMA, field_mappings)
+        mapped_required = len(required_fields.keys() & field_mappings.keys())
         total_required = len(required_fields)
         
         progress = mapped_required / total_required if total_required > 0 else 0
@@ -2083,11 +2207,11 @@ def _render_validation_section(db_manager, data_processor):
         # Run validation
         with st.spinner("🔍 Validating data..."):
             try:
-                validation_errors = validate_mapping(df, field_mappings, data_processor)
+                validation_errors, error_count = _validate_mapping_cached(df, field_mappings, data_processor)
                 st.session_state.validation_errors = validation_errors
                 
                 if validation_errors:
-                    can_proceed = create_validation_summary_card(validation_errors, len(df))
+                    can_proceed = create_validation_summary_card(validation_errors, len(df), error_count)
                     show_validation_errors(validation_errors)
                     
                     col1, col2 = st.columns(2)
@@ -2109,7 +2233,7 @@ def _render_validation_section(db_manager, data_processor):
                     # Check if configuration was already auto-saved in mapping section
                     config = st.session_state.selected_configuration
                     current_mappings = config.get('field_mappings', {})
-                    has_current_mappings = any(not key.startswith('_') for key in current_mappings.keys())
+                    has_current_mappings = _has_real_mappings(current_mappings)
                     
                     if not has_current_mappings:
                         # Only save if not already saved
@@ -2153,10 +2277,8 @@ def _render_processing_section(db_manager, data_processor):
             col1, col2, col3 = st.columns(3)
             with col1:
                 if st.button("🔄 Process Another File", type="primary", key="process_another_main", use_container_width=True):
-                    keys_to_clear = ['uploaded_df', 'uploaded_file_name', 'file_headers', 'validation_passed', 'header_comparison', 'field_mappings', 'mapping_tab_index', 'processing_completed', 'processing_results', 'load_results', 'processing_in_progress', 'validation_errors', 'mapping_section_expanded']
-                    for key in keys_to_clear:
-                        if key in st.session_state:
-                            del st.session_state[key]
+                    for key in _RESET_KEYS:
+                        st.session_state.pop(key, None)
                     st.rerun()
             
             with col2:
@@ -2166,9 +2288,10 @@ def _render_processing_section(db_manager, data_processor):
             
             with col3:
                 if st.button("🏠 Start Over", key="start_over_main", use_container_width=True):
-                    for key in list(st.session_state.keys()):
-                        if key not in ['sidebar_state']:  # Keep sidebar state
-                            del st.session_state[key]
+                    # Keep sidebar state; everything else goes in one clear()
+                    preserved = {key: st.session_state[key] for key in ('sidebar_state',) if key in st.session_state}
+                    st.session_state.clear()
+                    st.session_state.update(preserved)
                     st.rerun()
         else:
             # Show original process button
@@ -2202,107 +2325,116 @@ def _render_results_summary_section():
         results = st.session_state.get('processing_results', {})
         
         if results:
-            # Get key metrics
-            success_rate = results.get('success_rate', 0)
-            total_records = results.get('total_records', 0)
-            successful_records = results.get('successful_records', 0)
-            failed_records = results.get('failed_records', 0)
-            processing_time = results.get('processing_time', 0)
+            _render_results_summary_fragment(results)
+        else:
+            st.info("No processing results available")
+
+@fragment
+def _render_results_summary_fragment(results):
+    """Render metrics, downloads and detailed results; reruns independently of the page"""
+    # Get key metrics
+    success_rate = results.get('success_rate', 0)
+    total_records = results.get('total_records', 0)
+    successful_records = results.get('successful_records', 0)
+    failed_records = results.get('failed_records', 0)
+    processing_time = results.get('processing_time', 0)
+    
+    # Performance metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Records", f"{total_records:,}")
+    with col2:
+        st.metric("Success Rate", f"{success_rate:.0f}%")
+    with col3:
+        st.metric("Processing Time", f"{processing_time:.1f}s")
+    with col4:
+        avg_time = processing_time / total_records if total_records > 0 else 0
+        st.metric("Per Record", f"{avg_time:.2f}s")
+    
+    # Download options
+    st.markdown("### 📥 Download Options")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("📄 Download Processing Report", key="download_report", use_container_width=True):
+            # Create processing report
+            report_data = {
+                'Processing Summary': {
+                    'Total Records': total_records,
+                    'Successful': successful_records,
+                    'Failed': failed_records,
+                    'Success Rate': f"{success_rate:.1f}%",
+                    'Processing Time': f"{processing_time:.1f} seconds",
+                    'Average per Record': f"{avg_time:.3f} seconds"
+                },
+                'Session Info': {
+                    'Session ID': results.get('session_id', 'Unknown'),
+                    'Configuration': results.get('configuration_name', 'Unknown'),
+                    'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }
+            }
             
-            # Performance metrics
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Total Records", f"{total_records:,}")
-            with col2:
-                st.metric("Success Rate", f"{success_rate:.0f}%")
-            with col3:
-                st.metric("Processing Time", f"{processing_time:.1f}s")
-            with col4:
-                avg_time = processing_time / total_records if total_records > 0 else 0
-                st.metric("Per Record", f"{avg_time:.2f}s")
+            report_json = json.dumps(report_data, indent=2)
+            st.download_button(
+                label="💾 Save Report",
+                data=report_json,
+                file_name=f"processing_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+    
+    with col2:
+        if st.button("📊 View Detailed Results", key="show_details", use_container_width=True):
+            st.session_state.show_detailed_results = not st.session_state.get('show_detailed_results', False)
+    
+    # Show detailed results if requested
+    if st.session_state.get('show_detailed_results', False):
+        st.markdown("### 📋 Detailed Results")
+        
+        # Show load results if available
+        if 'load_results' in st.session_state:
+            load_results = st.session_state.load_results
             
-            # Download options
-            st.markdown("### 📥 Download Options")
-            col1, col2 = st.columns(2)
+            # Split once per processing run; reruns while the panel is open reuse the split
+            cached_split = st.session_state.get('_load_results_split')
+            if cached_split is None or cached_split[0] is not load_results:
+                cached_split = (load_results, *_partition_results(load_results))
+                st.session_state._load_results_split = cached_split
+            _, successful_loads, failed_loads = cached_split
             
-            with col1:
-                if st.button("📄 Download Processing Report", key="download_report", use_container_width=True):
-                    # Create processing report
-                    report_data = {
-                        'Processing Summary': {
-                            'Total Records': total_records,
-                            'Successful': successful_records,
-                            'Failed': failed_records,
-                            'Success Rate': f"{success_rate:.1f}%",
-                            'Processing Time': f"{processing_time:.1f} seconds",
-                            'Average per Record': f"{avg_time:.3f} seconds"
-                        },
-                        'Session Info': {
-                            'Session ID': results.get('session_id', 'Unknown'),
-                            'Configuration': results.get('configuration_name', 'Unknown'),
-                            'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if successful_records > 0:
+                st.markdown("**✅ Successful Loads:**")
+                if successful_loads:
+                    success_df = pd.DataFrame([
+                        {
+                            'Load Number': r.get('load_number', 'Unknown'),
+                            'Row': r.get('row_index', 'Unknown'),
+                            'Status': '✅ Success'
                         }
-                    }
+                        for r in successful_loads[:20]  # Show first 20
+                    ])
+                    st.dataframe(success_df, use_container_width=True, hide_index=True)
                     
-                    import json
-                    report_json = json.dumps(report_data, indent=2)
-                    st.download_button(
-                        label="💾 Save Report",
-                        data=report_json,
-                        file_name=f"processing_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json"
-                    )
-            
-            with col2:
-                if st.button("📊 View Detailed Results", key="show_details", use_container_width=True):
-                    st.session_state.show_detailed_results = not st.session_state.get('show_detailed_results', False)
+                    if len(successful_loads) > 20:
+                        st.caption(f"... and {len(successful_loads) - 20} more successful loads")
             
-            # Show detailed results if requested
-            if st.session_state.get('show_detailed_results', False):
-                st.markdown("### 📋 Detailed Results")
-                
-                # Show load results if available
-                if 'load_results' in st.session_state:
-                    load_results = st.session_state.load_results
+            if failed_records > 0:
+                st.markdown("**❌ Failed Loads:**")
+                if failed_loads:
+                    failed_df = pd.DataFrame([
+                        {
+                            'Load Number': r.get('load_number', 'Unknown'),
+                            'Row': r.get('row_index', 'Unknown'),
+                            'Error': r.get('error', 'Unknown error')[:100] + ('...' if len(r.get('error', '')) > 100 else '')
+                        }
+                        for r in failed_loads[:20]  # Show first 20
+                    ])
+                    st.dataframe(failed_df, use_container_width=True, hide_index=True)
                     
-                    if successful_records > 0:
-                        st.markdown("**✅ Successful Loads:**")
-                        successful_loads = [r for r in load_results if r.get('success', False)]
-                        if successful_loads:
-                            success_df = pd.DataFrame([
-                                {
-                                    'Load Number': r.get('load_number', 'Unknown'),
-                                    'Row': r.get('row_index', 'Unknown'),
-                                    'Status': '✅ Success'
-                                }
-                                for r in successful_loads[:20]  # Show first 20
-                            ])
-                            st.dataframe(success_df, use_container_width=True, hide_index=True)
-                            
-                            if len(successful_loads) > 20:
-                                st.caption(f"... and {len(successful_loads) - 20} more successful loads")
+                    if len(failed_loads) > 20:
+                        st.caption(f"... and {len(failed_loads) - 20} more failed loads")
                     
-                    if failed_records > 0:
-                        st.markdown("**❌ Failed Loads:**")
-                        failed_loads = [r for r in load_results if not r.get('success', False)]
-                        if failed_loads:
-                            failed_df = pd.DataFrame([
-                                {
-                                    'Load Number': r.get('load_number', 'Unknown'),
-                                    'Row': r.get('row_index', 'Unknown'),
-                                    'Error': r.get('error', 'Unknown error')[:100] + ('...' if len(r.get('error', '')) > 100 else '')
-                                }
-                                for r in failed_loads[:20]  # Show first 20
-                            ])
-                            st.dataframe(failed_df, use_container_width=True, hide_index=True)
-                            
-                            if len(failed_loads) > 20:
-                                st.caption(f"... and {len(failed_loads) - 20} more failed loads")
-                            
-                            # Add full error details for truncated errors
-                            render_full_error_details(failed_loads, "failed_loads")
-        else:
-            st.info("No processing results available")
+                    # Add full error details for truncated errors
+                    render_full_error_details(failed_loads, "failed_loads")
 
 def _save_configuration(db_manager, field_mappings, file_headers):
     """Save configuration with field mappings"""
@@ -2321,6 +2453,8 @@ def _save_configuration(db_manager, field_mappings, file_headers):
             bearer_token=config.get('bearer_token')
         )
         
+        _invalidate_db_stats()
+        
         # Update session state
         st.session_state.selected_configuration['field_mappings'] = field_mappings
         st.session_state.selected_configuration['field_count'] = len(field_mappings)
@@ -2328,6 +2462,22 @@ def _save_configuration(db_manager, field_mappings, file_headers):
     except Exception as e:
         st.error(f"❌ Failed to save configuration: {str(e)}")
 
+def _compact_json(obj):
+    """Compact JSON text, via orjson when installed and able to encode obj"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+def _partition_results(results):
+    """Split load results into (successful, failed) lists in a single pass, keeping order"""
+    successful, failed = [], []
+    for result in results:
+        (successful if result.get('success', False) else failed).append(result)
+    return successful, failed
+
 def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, data_processor, db_manager, session_id):
     """Enhanced data processing with detailed tracking and error handling"""
     
@@ -2337,7 +2487,6 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
     config_brokerage = current_config.get('brokerage_name', '')
     
     if brokerage_name != current_brokerage or config_brokerage != current_brokerage:
-        import logging
         logging.error(f"SECURITY ALERT: Processing blocked - brokerage mismatch. Processing brokerage: '{brokerage_name}', Current brokerage: '{current_brokerage}', Config brokerage: '{config_brokerage}'")
         st.error("🚨 **SECURITY ERROR**: Configuration/brokerage mismatch detected. Processing blocked to prevent data being sent to wrong destination.")
         st.session_state.processing_in_progress = False
@@ -2370,7 +2519,6 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
         step_indicator = st.empty()
         
         # Start timing
-        import time
         start_time = time.time()
         
         def update_progress(step_name, step_number, details=""):
@@ -2434,22 +2582,22 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
         update_progress("Validating data", 3, "Checking data quality and format compliance...")
         
         with st.spinner("Validating data format and requirements..."):
-            validated_df, validation_errors = data_processor.validate_data(mapped_df, get_full_api_schema())
+            validated_df, validation_errors = data_processor.validate_data_vectorized(mapped_df, API_SCHEMA)
         
         detailed_errors = []
         if validation_errors:
             st.warning(f"⚠️ Found {len(validation_errors)} validation issues (processing will continue)")
             # Convert validation errors to detailed format for database storage
             for error in validation_errors:
-                detailed_errors.append({
-                    'row_number': error.get('row', 1),
-                    'field_name': 'general',
-                    'error_type': 'validation',
-                    'error_message': str(error),
-                    'suggested_fix': 'Review data format and field mappings',
-                    'original_value': '',
-                    'expected_format': 'API compliant format'
-                })
+                detailed_errors.append(DetailedError(
+                    row_number=error.get('row', 1),
+                    field_name='general',
+                    error_type='validation',
+                    error_message=str(error),
+                    suggested_fix='Review data format and field mappings',
+                    original_value='',
+                    expected_format='API compliant format'
+                ))
         
         # Step 4: Format for API
         update_progress("Formatting for API", 4, "Converting data to API-compatible format...")
@@ -2473,42 +2621,28 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
         successful_count = 0
         failed_count = 0
         
-        for i, payload in enumerate(api_payloads):
+        # Intended load numbers, looked up once rather than per result
+        payload_load_numbers = [(payload.get('load') or {}).get('loadNumber') for payload in api_payloads]
+        
+        # Loads are submitted concurrently; results arrive in completion order
+        submissions = client.iter_create_loads(
+            api_payloads, max_workers=API_SUBMISSION_CONCURRENCY, max_per_second=API_SUBMISSION_RATE_LIMIT
+        )
+        total_payloads = len(api_payloads)
+        last_ui_update = 0.0
+        errors_changed = False
+        for completed, (i, result) in enumerate(submissions, start=1):
+            payload = api_payloads[i]
+            
             # Prevent websocket timeout during long processing sessions
-            if i % 10 == 0:
+            if completed % 10 == 0:
                 st.empty()  # Send keep-alive ping to maintain websocket connection
-                time.sleep(0.1)  # Brief pause to prevent timeout
             
-            # Update API progress
-            api_progress = int((i / len(api_payloads)) * 100)
-            api_progress_bar.progress(api_progress)
-            api_status.text(f"Processing load {i+1}/{len(api_payloads)} (✅ {successful_count} | ❌ {failed_count})")
-            
-            # Submit individual load
-            result = client.create_load(payload)
             result['row_index'] = i + 1
             
-            # Enhanced: Extract load number from successful responses
-            if result.get('success', False):
-                load_number = None
-                # Try to get load number from API response
-                if 'data' in result and isinstance(result['data'], dict):
-                    # Check various possible locations for load number
-                    load_number = (result['data'].get('loadNumber') or 
-                                 result['data'].get('load', {}).get('loadNumber') or
-                                 result['data'].get('id'))
-                
-                # Fallback to original payload if not in response
-                if not load_number and 'load' in payload:
-                    load_number = payload['load'].get('loadNumber')
-                
-                result['load_number'] = load_number or f"Load-{i+1}"
-            else:
-                # For failed loads, still try to get the intended load number
-                load_number = None
-                if 'load' in payload:
-                    load_number = payload['load'].get('loadNumber')
-                result['load_number'] = load_number or f"Load-{i+1}"
+            # The client already extracts the load number from successful responses;
+            # fall back to the intended load number from the payload, then the row
+            result['load_number'] = result.get('load_number') or payload_load_numbers[i] or f"Load-{i+1}"
             
             results.append(result)
             
@@ -2526,27 +2660,43 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
                     'timestamp': datetime.now().strftime('%H:%M:%S')
                 }
                 live_errors.append(error_detail)
-                
-                # Update live error display (show last 5 errors)
-                if live_errors:
-                    error_display = "🔴 **Recent Errors:**\n"
-                    for err in live_errors[-5:]:  # Show last 5 errors
-                        error_display += f"• Row {err['row']} ({err['load_number']}) at {err['timestamp']}: {err['error'][:100]}{'...' if len(err['error']) > 100 else ''}\n"
-                    error_stream.error(error_display)
+                errors_changed = True
                 
                 # Add detailed error for database storage
-                detailed_errors.append({
-                    'row_number': i + 1,
-                    'field_name': 'api_submission',
-                    'error_type': 'api_error',
-                    'error_message': result.get('error', 'Unknown API error'),
-                    'suggested_fix': 'Review API response and data format',
-                    'original_value': str(payload),
-                    'expected_format': 'Valid API payload'
-                })
+                detailed_errors.append(DetailedError(
+                    row_number=i + 1,
+                    field_name='api_submission',
+                    error_type='api_error',
+                    error_message=result.get('error', 'Unknown API error'),
+                    suggested_fix='Review API response and data format',
+                    # Reference the load rather than stringifying its whole payload,
+                    # unless debug logging asks for the full body
+                    original_value=str(payload) if logger.isEnabledFor(logging.DEBUG) else f"loadNumber: {result['load_number']}",
+                    expected_format='Valid API payload'
+                ))
             
-            # Small delay for rate limiting
-            time.sleep(0.05)
+            # Repaint at most every API_PROGRESS_UPDATE_INTERVAL seconds, and always for the last load
+            now = time.monotonic()
+            if now - last_ui_update < API_PROGRESS_UPDATE_INTERVAL and completed < total_payloads:
+                continue
+            last_ui_update = now
+            
+            # Update live error display (show last 5 errors)
+            if errors_changed:
+                error_display = "🔴 **Recent Errors:**\n"
+                for err in live_errors[-5:]:  # Show last 5 errors
+                    error_display += f"• Row {err['row']} ({err['load_number']}) at {err['timestamp']}: {err['error'][:100]}{'...' if len(err['error']) > 100 else ''}\n"
+                error_stream.error(error_display)
+                errors_changed = False
+            
+            # Update API progress
+            api_progress = int((completed / total_payloads) * 100)
+            api_progress_bar.progress(api_progress)
+            api_status.text(f"Processed load {completed}/{total_payloads} (✅ {successful_count} | ❌ {failed_count})")
+        
+        # Restore original row order for reporting and history
+        results.sort(key=lambda r: r['row_index'])
+        successful_loads, failed_loads = _partition_results(results)
         
         # Clear API progress indicators
         api_progress_bar.empty()
@@ -2568,7 +2718,7 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
                 total_records=len(df),
                 successful_records=successful_count,
                 failed_records=failed_count,
-                error_log=json.dumps([r for r in results if not r.get('success', False)]),
+                error_log=_compact_json(failed_loads),
                 processing_time=processing_time,
                 file_headers=st.session_state.file_headers,
                 session_id=session_id
@@ -2577,6 +2727,7 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
             # Save detailed errors for troubleshooting
             if detailed_errors:
                 db_manager.save_processing_errors(upload_id, detailed_errors)
+            _invalidate_db_stats()
         
         # Final progress update
         progress_bar.progress(100)
@@ -2639,27 +2790,23 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
             with st.expander("📋 Load Results Summary", expanded=False):
                 st.markdown("**Load Creation Results:**")
                 
-                # Create results summary
-                load_results = []
-                for result in results:
-                    load_number = result.get('load_number', f"Row {result.get('row_index', 'Unknown')}")
-                    status = "✅ Success" if result.get('success', False) else "❌ Failed"
-                    error_msg = result.get('error', '') if not result.get('success', False) else ''
-                    
-                    load_results.append({
-                        'Load Number': load_number,
-                        'Status': status,
-                        'Error': error_msg[:50] + ('...' if len(error_msg) > 50 else '') if error_msg else ''
-                    })
+                # Create results summary column-wise rather than one dict per row
+                results_df = pd.DataFrame.from_records(results, columns=['load_number', 'success', 'error'])
+                succeeded = results_df['success'].fillna(False).astype(bool)
+                errors = results_df['error'].where(~succeeded).fillna('').astype(str)
+                short_errors = errors.str.slice(0, 50)
                 
                 # Display as DataFrame for easy scanning
-                results_df = pd.DataFrame(load_results)
+                results_df = pd.DataFrame({
+                    'Load Number': results_df['load_number'],
+                    'Status': succeeded.map({True: "✅ Success", False: "❌ Failed"}),
+                    'Error': short_errors.where(errors.str.len() <= 50, short_errors + '...')
+                })
                 st.dataframe(results_df, use_container_width=True, hide_index=True)
                 
                 # Quick filter view
                 col1, col2 = st.columns(2)
                 with col1:
-                    successful_loads = [r for r in results if r.get('success', False)]
                     if successful_loads:
                         st.markdown("**✅ Successful Loads:**")
                         for result in successful_loads[:10]:  # Show first 10
@@ -2669,7 +2816,6 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
                             st.caption(f"... and {len(successful_loads) - 10} more")
                 
                 with col2:
-                    failed_loads = [r for r in results if not r.get('success', False)]
                     if failed_loads:
                         st.markdown("**❌ Failed Loads:**")
                         for result in failed_loads[:10]:  # Show first 10
@@ -2696,17 +2842,12 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
         # Failed records details (only if there are failures)
         if failed_count > 0:
             with st.expander(f"❌ Failed Records Details ({failed_count} records)"):
-                failed_records = []
-                for r in results:
-                    if not r.get('success', False):
-                        failed_records.append({
-                            'Row': r.get('row_index', 'Unknown'),
-                            'Error': r.get('error', 'Unknown error'),
-                            'Status Code': r.get('status_code', 'N/A')
-                        })
-                
-                if failed_records:
-                    failed_df = pd.DataFrame(failed_records)
+                # Reuse the failed list split off after submission
+                if failed_loads:
+                    failed_df = pd.DataFrame.from_records(
+                        failed_loads, columns=['row_index', 'error', 'status_code']
+                    ).rename(columns={'row_index': 'Row', 'error': 'Error', 'status_code': 'Status Code'})
+                    failed_df = failed_df.fillna({'Error': 'Unknown error', 'Status Code': 'N/A'})
                     st.dataframe(failed_df, use_container_width=True, hide_index=True)
                     
                     # Download failed records
@@ -2734,10 +2875,16 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
     except Exception as e:
         # Enhanced error handling with full details
         import traceback
+        full_traceback = traceback.format_exc()
+        
+        # Release the intermediate mapped/validated frames and payloads before rendering
+        # the error UI; the uploaded DataFrame itself stays in session state
+        mapped_df = validated_df = api_payloads = results = None
+        
         error_details = {
             'error_type': type(e).__name__,
             'error_message': str(e),
-            'full_traceback': traceback.format_exc(),
+            'full_traceback': full_traceback,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'brokerage': brokerage_name,
             'session_id': session_id,
@@ -2786,7 +2933,8 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
                 help="Download detailed error report for debugging"
             )
         
-        logger.error(f"Processing error details: {json.dumps(error_details, indent=2)}")
+        # Lazy %-formatting: the dict is only rendered if a handler emits the record
+        logger.error("Processing error details: %s", error_details)
         
         # Clear processing flag on error to prevent UI state issues
         st.session_state.processing_in_progress = False
@@ -2804,8 +2952,7 @@ def process_data_enhanced(df, field_mappings, api_credentials, brokerage_name, d
 def get_smart_mappings(df, data_processor):
     """Get smart field mapping suggestions"""
     try:
-        api_schema = get_full_api_schema()
-        return data_processor.suggest_mapping(list(df.columns), api_schema, df)
+        return suggest_mapping_cached(data_processor, df)
     except Exception as e:
         logger.warning(f"Smart mapping failed: {str(e)}")
         return {}
@@ -2834,6 +2981,9 @@ def show_mapping_suggestions(suggested_mappings, api_schema, df):
     
     return updated_mappings
 
+# Loopback hosts that API base URLs must not point at (case-insensitive substring match)
+_BLOCKED_HOSTS = re.compile(r'localhost|127\.0\.0\.1|0\.0\.0\.0|\[::1\]', re.IGNORECASE)
+
 def validate_api_input(api_key: str, base_url: str) -> tuple[bool, str]:
     """Validate API input parameters"""
     if not api_key or len(api_key.strip()) < 10:
@@ -2843,7 +2993,7 @@ def validate_api_input(api_key: str, base_url: str) -> tuple[bool, str]:
         return False, "Base URL must start with http:// or https://"
     
     # Additional validation
-    if 'localhost' in base_url.lower() or '127.0.0.1' in base_url:
+    if _BLOCKED_HOSTS.search(base_url):
         return False, "Cannot connect to localhost URLs"
     
     return True, "Valid"
@@ -2857,7 +3007,6 @@ def process_data(df, field_mappings, api_credentials, customer_name, data_proces
     config_brokerage = current_config.get('brokerage_name', '')
     
     if customer_name != current_brokerage or config_brokerage != current_brokerage:
-        import logging
         logging.error(f"SECURITY ALERT: Legacy processing blocked - brokerage mismatch. Processing customer: '{customer_name}', Current brokerage: '{current_brokerage}', Config brokerage: '{config_brokerage}'")
         st.error("🚨 **SECURITY ERROR**: Configuration/brokerage mismatch detected. Processing blocked.")
         return None
@@ -2886,7 +3035,6 @@ def process_data(df, field_mappings, api_credentials, customer_name, data_proces
         step_indicator = st.empty()
         
         # Start timing
-        import time
         start_time = time.time()
         
         def update_progress(step_name, step_number, details=""):
@@ -2939,7 +3087,7 @@ def process_data(df, field_mappings, api_credentials, customer_name, data_proces
         update_progress("Validating data", 3, "Checking data quality and format compliance...")
         
         with st.spinner("Validating data format and requirements..."):
-            validated_df, validation_errors = data_processor.validate_data(mapped_df, get_full_api_schema())
+            validated_df, validation_errors = data_processor.validate_data(mapped_df, API_SCHEMA)
         
         return validation_errors
         
@@ -2972,68 +3120,87 @@ def show_validation_errors(validation_errors):
     
     st.markdown("### ⚠️ Validation Issues Found")
     
-    # Group errors by type for better display
-    error_summary = {}
+    # Group errors by type for better display, keeping only the first 10 of each type
+    error_counts = defaultdict(int)
+    error_samples = defaultdict(list)
     for error in validation_errors:
         error_type = error.get('type', 'general')
-        if error_type not in error_summary:
-            error_summary[error_type] = []
-        error_summary[error_type].append(error)
+        error_counts[error_type] += 1
+        if error_counts[error_type] <= 10:
+            error_samples[error_type].append(error)
     
     # Display errors by type
-    for error_type, errors in error_summary.items():
-        with st.expander(f"{error_type.title()} Errors ({len(errors)} issues)", expanded=True):
-            for i, error in enumerate(errors[:10]):  # Show first 10 errors
+    for error_type, error_count in error_counts.items():
+        with st.expander(f"{error_type.title()} Errors ({error_count} issues)", expanded=True):
+            for error in error_samples[error_type]:  # Show first 10 errors
                 row_info = f"Row {error.get('row', 'Unknown')}" if error.get('row') else "General"
                 error_text = ', '.join(error.get('errors', ['Unknown error']))
                 st.markdown(f"**{row_info}:** {error_text}")
             
-            if len(errors) > 10:
-                st.info(f"... and {len(errors) - 10} more {error_type} errors")
+            if error_count > 10:
+                st.info(f"... and {error_count - 10} more {error_type} errors")
+
+# Field name mappings for user-friendly descriptions
+FRIENDLY_FIELDS = MappingProxyType({
+    'load.loadNumber': 'Load Number',
+    'load.mode': 'Transportation Mode (FTL/LTL)',
+    'load.rateType': 'Rate Type (Spot/Contract)',
+    'load.status': 'Load Status',
+    'load.route.0.address.street1': 'Pickup Address',
+    'load.route.0.address.city': 'Pickup City',
+    'load.route.0.address.stateOrProvince': 'Pickup State',
+    'load.route.0.address.postalCode': 'Pickup ZIP Code',
+    'load.route.0.address.country': 'Pickup Country',
+    'load.route.0.expectedArrivalWindowStart': 'Pickup Date/Time',
+    'load.route.0.expectedArrivalWindowEnd': 'Pickup Window End',
+    'load.route.1.address.street1': 'Delivery Address',
+    'load.route.1.address.city': 'Delivery City',
+    'load.route.1.address.stateOrProvince': 'Delivery State',
+    'load.route.1.address.postalCode': 'Delivery ZIP Code',
+    'load.route.1.expectedArrivalWindowStart': 'Delivery Date/Time',
+    'customer.customerId': 'Customer ID',
+    'customer.name': 'Customer Name',
+    'load.items.0.quantity': 'Item Quantity',
+    'load.items.0.totalWeightLbs': 'Total Weight (lbs)',
+    'bidCriteria.targetCostUsd': 'Target Cost ($)',
+    'carrier.name': 'Carrier Name',
+    'carrier.dotNumber': 'DOT Number',
+    'carrier.mcNumber': 'MC Number'
+})
+
+# Single-pass patterns; longest field names first so prefixes never win
+_FRIENDLY_FIELD_RE = re.compile('|'.join(
+    re.escape(name) for name in sorted(FRIENDLY_FIELDS, key=len, reverse=True)
+))
+
+# Cheap presence probe on the field-name prefixes; most messages carry no field name at all
+_FRIENDLY_FIELD_PROBE = re.compile('|'.join(
+    re.escape(prefix + '.') for prefix in sorted({name.split('.', 1)[0] for name in FRIENDLY_FIELDS})
+))
+
+_FRIENDLY_PHRASES = MappingProxyType({
+    'Missing required field:': 'Missing:',
+    'Invalid value': 'Invalid value in',
+    'Valid values:': 'Accepted values:'
+})
+_FRIENDLY_PHRASE_RE = re.compile('|'.join(re.escape(phrase) for phrase in _FRIENDLY_PHRASES))
+
+def _friendly_field(match):
+    return FRIENDLY_FIELDS[match.group(0)]
+
+def _friendly_phrase(match):
+    return _FRIENDLY_PHRASES[match.group(0)]
 
 def _make_error_user_friendly(error_str):
     """Convert technical error messages to user-friendly ones"""
     
-    # Field name mappings for user-friendly descriptions
-    field_mappings = {
-        'load.loadNumber': 'Load Number',
-        'load.mode': 'Transportation Mode (FTL/LTL)',
-        'load.rateType': 'Rate Type (Spot/Contract)',
-        'load.status': 'Load Status',
-        'load.route.0.address.street1': 'Pickup Address',
-        'load.route.0.address.city': 'Pickup City',
-        'load.route.0.address.stateOrProvince': 'Pickup State',
-        'load.route.0.address.postalCode': 'Pickup ZIP Code',
-        'load.route.0.address.country': 'Pickup Country',
-        'load.route.0.expectedArrivalWindowStart': 'Pickup Date/Time',
-        'load.route.0.expectedArrivalWindowEnd': 'Pickup Window End',
-        'load.route.1.address.street1': 'Delivery Address',
-        'load.route.1.address.city': 'Delivery City',
-        'load.route.1.address.stateOrProvince': 'Delivery State',
-        'load.route.1.address.postalCode': 'Delivery ZIP Code',
-        'load.route.1.expectedArrivalWindowStart': 'Delivery Date/Time',
-        'customer.customerId': 'Customer ID',
-        'customer.name': 'Customer Name',
-        'load.items.0.quantity': 'Item Quantity',
-        'load.items.0.totalWeightLbs': 'Total Weight (lbs)',
-        'bidCriteria.targetCostUsd': 'Target Cost ($)',
-        'carrier.name': 'Carrier Name',
-        'carrier.dotNumber': 'DOT Number',
-        'carrier.mcNumber': 'MC Number'
-    }
-    
     # Replace technical field names with user-friendly ones
     user_friendly = error_str
-    for technical_name, friendly_name in field_mappings.items():
-        if technical_name in user_friendly:
-            user_friendly = user_friendly.replace(technical_name, friendly_name)
+    if _FRIENDLY_FIELD_PROBE.search(user_friendly):
+        user_friendly = _FRIENDLY_FIELD_RE.sub(_friendly_field, user_friendly)
     
     # Make other improvements
-    user_friendly = user_friendly.replace("Missing required field:", "Missing:")
-    user_friendly = user_friendly.replace("Invalid value", "Invalid value in")
-    user_friendly = user_friendly.replace("Valid values:", "Accepted values:")
-    
-    return user_friendly
+    return _FRIENDLY_PHRASE_RE.sub(_friendly_phrase, user_friendly)
 
 # Settings and history functionality integrated into main workflow and sidebar
 
@@ -3046,6 +3213,36 @@ def get_company_list(db_manager):
         logger.error(f"Failed to get company list: {str(e)}")
         return []
 
+DB_STATS_TTL = 30  # seconds
+
+@st.cache_data(ttl=DB_STATS_TTL, show_spinner=False)
+def _cached_db_stats():
+    """Database row counts, refreshed at most every 30s instead of on every rerun"""
+    return _get_db_manager().get_database_stats()
+
+def _db_stats():
+    """Database row counts for this session, re-read after a write or once older than the TTL"""
+    now = time.monotonic()
+    if st.session_state.get('_stats_dirty', False):
+        # This session wrote; another module may have done so without clearing the
+        # shared cache, so read the database directly rather than pre-write counts
+        _cached_db_stats.clear()
+        st.session_state._cached_stats = _get_db_manager().get_database_stats()
+        st.session_state._cached_stats_at = now
+        st.session_state._stats_dirty = False
+    elif ('_cached_stats' not in st.session_state or
+            now - st.session_state.get('_cached_stats_at', 0) > DB_STATS_TTL):
+        # First use in this session, or stale: read through the shared cache, which
+        # also picks up writes from other sessions at its own pace
+        st.session_state._cached_stats = _cached_db_stats()
+        st.session_state._cached_stats_at = now
+    return st.session_state._cached_stats
+
+def _invalidate_db_stats():
+    """Drop cached row counts after a database write"""
+    _cached_db_stats.clear()
+    st.session_state._stats_dirty = True
+
 def render_database_management_section():
     """Add to sidebar for database backup/restore"""
     
@@ -3053,9 +3250,8 @@ def render_database_management_section():
     st.markdown("**💾 Database Management**")
     
     # Check if database has data
-    from src.backend.database import DatabaseManager
-    db_manager = DatabaseManager()
-    stats = db_manager.get_database_stats()
+    db_manager = _get_db_manager()
+    stats = _db_stats()
     
     # Check if database has any data (including brokerage configurations)
     has_data = (stats['customer_mappings'] > 0 or 
@@ -3085,18 +3281,19 @@ def render_database_management_section():
             st.download_button(
                 label="💾 Save Database Backup",
                 data=backup_data,
-                file_name=f"ff2api_backup_{current_time}.json",
-                mime="application/json"
+                file_name=f"ff2api_backup_{current_time}.zip",
+                mime="application/zip"
             )
             # Track backup creation time
             st.session_state.last_backup_time = datetime.now()
+            st.session_state.last_backup_monotonic = time.monotonic()
             st.success("✅ Backup ready for download!")
     else:
         # Empty database - show restore option
         st.warning("📭 Database is empty")
         uploaded_backup = st.file_uploader(
             "📤 Restore from backup", 
-            type=['json'],
+            type=['zip', 'json'],
             help="Upload a previous database backup"
         )
         
@@ -3104,6 +3301,7 @@ def render_database_management_section():
             if st.button("🔄 Restore Database"):
                 try:
                     restore_result = restore_database_from_backup(uploaded_backup, db_manager)
+                    _invalidate_db_stats()
                     if restore_result['success']:
                         # Show detailed success message
                         success_msg = "✅ Database restored successfully!"
@@ -3127,27 +3325,57 @@ def render_database_management_section():
 
 def create_database_backup():
     """Create comprehensive database backup"""
-    from src.backend.database import DatabaseManager
-    db_manager = DatabaseManager()
-    
-    backup_data = {
-        'backup_info': {
-            'created_at': datetime.now().isoformat(),
-            'version': '1.0',
-            'app_version': 'FF2API v1.0'
-        },
-        'brokerage_configurations': [],
-        'upload_history': [],
-        'processing_errors': []
+    db_manager = _get_db_manager()
+    
+    # Row counts plus the file's modification time change whenever any table is written,
+    # so repeated backup clicks reuse the serialized payload until the data changes.
+    # The mtime alone catches every write, so the counts can come from the 30s stats cache.
+    stats_key = tuple(sorted(_db_stats().items()))
+    return _build_database_backup(stats_key, _db_version(db_manager))
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_database_backup(stats_key, db_mtime):
+    """Serialize all configurations and recent upload history (cached per database fingerprint)"""
+    db_manager = _get_db_manager()
+    
+    backup_info = {
+        'created_at': datetime.now().isoformat(),
+        'version': '1.0',
+        'app_version': 'FF2API v1.0'
     }
     
-    # Export all brokerage configurations
-    brokerages = db_manager.get_all_brokerages()
-    for brokerage in brokerages:
+    # The JSON repeats the same keys per record and compresses very well; the zip
+    # layout is also what DatabaseManager.import_data reads on restore
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
+        # Records are written one at a time straight into the compressed entry, so
+        # the uncompressed JSON never exists in memory as a whole
+        with zipf.open('backup.json', 'w') as out:
+            out.write(b'{"backup_info": ' + json.dumps(backup_info).encode('utf-8'))
+            out.write(b', "brokerage_configurations": ')
+            _write_json_array(out, _iter_backup_configurations(db_manager))
+            out.write(b', "upload_history": ')
+            _write_json_array(out, _iter_backup_upload_history(db_manager))
+            out.write(b', "processing_errors": []}')
+    
+    return archive.getvalue()
+
+def _write_json_array(buffer, records):
+    """Write an iterable of JSON-serializable records to a binary stream as a JSON array"""
+    buffer.write(b'[')
+    for i, record in enumerate(records):
+        if i:
+            buffer.write(b', ')
+        buffer.write(json.dumps(record).encode('utf-8'))
+    buffer.write(b']')
+
+def _iter_backup_configurations(db_manager):
+    """Yield every brokerage configuration in backup format"""
+    for brokerage in db_manager.get_all_brokerages():
         configs = db_manager.get_brokerage_configurations(brokerage['name'])
         for config in configs:
             # Note: Export encrypted credentials for restore
-            backup_data['brokerage_configurations'].append({
+            yield {
                 'brokerage_name': brokerage['name'],
                 'configuration_name': config['name'],
                 'field_mappings': config['field_mappings'],
@@ -3158,75 +3386,46 @@ def create_database_backup():
                 'created_at': config['created_at'],
                 'updated_at': config['updated_at'],
                 'description': config.get('description', '')
-            })
-    
+            }
+
+# Only the fields written to backups; error_log and file_headers are never read here
+_BACKUP_HISTORY_COLUMNS = (
+    'brokerage_name', 'configuration_name', 'filename', 'total_records',
+    'successful_records', 'failed_records', 'upload_timestamp'
+)
+
+def _iter_backup_upload_history(db_manager):
+    """Yield recent upload history records in backup format"""
     # Export upload history (last 100 records to keep size manageable)
     # Improved data structure with proper type handling
-    upload_history = db_manager.get_upload_history(limit=100)
-    for record in upload_history:
-        # record is a tuple from SQLite, extract values safely
+    for record in db_manager.iter_upload_history(limit=100, columns=_BACKUP_HISTORY_COLUMNS):
+        # Rows are sqlite3.Row objects, so columns are read by name
         try:
-            # Handle different record lengths from schema evolution
-            brokerage_name = record[1] if len(record) > 1 else 'Unknown'
-            configuration_name = record[2] if len(record) > 2 else 'Unknown'
-            filename = record[3] if len(record) > 3 else 'unknown_file.csv'
-            total_records = int(record[4]) if len(record) > 4 and record[4] is not None else 0
-            successful_records = int(record[5]) if len(record) > 5 and record[5] is not None else 0
-            failed_records = int(record[6]) if len(record) > 6 and record[6] is not None else 0
-            
-            # Handle timestamp - could be in different positions due to schema changes
-            upload_timestamp = None
-            if len(record) > 11 and record[11] is not None:
-                upload_timestamp = record[11]
-            elif len(record) > 7 and record[7] is not None:
-                upload_timestamp = record[7]
-            else:
-                upload_timestamp = datetime.now().isoformat()
-            
-            backup_data['upload_history'].append({
-                'brokerage_name': str(brokerage_name),
-                'configuration_name': str(configuration_name),
-                'filename': str(filename),
-                'total_records': total_records,
-                'successful_records': successful_records,
-                'failed_records': failed_records,
-                'upload_timestamp': upload_timestamp
-            })
-        except (IndexError, ValueError, TypeError) as e:
+            yield {
+                'brokerage_name': str(record['brokerage_name']),
+                'configuration_name': str(record['configuration_name']),
+                'filename': str(record['filename']),
+                'total_records': int(record['total_records'] or 0),
+                'successful_records': int(record['successful_records'] or 0),
+                'failed_records': int(record['failed_records'] or 0),
+                'upload_timestamp': record['upload_timestamp'] or datetime.now().isoformat()
+            }
+        except (ValueError, TypeError) as e:
             # Skip malformed records but log the issue
             logger.warning(f"Skipping malformed upload history record: {e}")
             continue
-    
-    return json.dumps(backup_data, indent=2)
 
 def restore_database_from_backup(uploaded_file, db_manager):
     """Restore database from uploaded backup"""
     try:
-        # Create a temporary file for the import_data method which expects a zip file
-        import tempfile
-        import zipfile
+        # The upload is already an in-memory binary file; read the archive from it
+        # directly instead of copying its bytes into a second buffer
+        if zipfile.is_zipfile(uploaded_file):
+            uploaded_file.seek(0)
+            return db_manager.import_data(uploaded_file)
         
-        # Read the JSON data
-        uploaded_file.seek(0)  # Reset file pointer
-        json_data = uploaded_file.read()
-        
-        # Create a temporary zip file containing the JSON
-        with tempfile.NamedTemporaryFile(mode='w+b', suffix='.zip', delete=False) as temp_zip:
-            with zipfile.ZipFile(temp_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                zipf.writestr('backup.json', json_data)
-            temp_zip_path = temp_zip.name
-        
-        try:
-            # Use the improved import_data method from DatabaseManager
-            result = db_manager.import_data(temp_zip_path)
-            return result
-        finally:
-            # Clean up temporary file
-            import os
-            try:
-                os.unlink(temp_zip_path)
-            except:
-                pass
+        # Older backups were plain JSON and can be imported directly
+        return db_manager.import_data_from_json(uploaded_file.getvalue())
         
     except Exception as e:
         return {'success': False, 'error': str(e)}
@@ -3238,64 +3437,85 @@ def get_container_start_time():
     # Store in session state when app first loads
     if 'app_start_time' not in st.session_state:
         st.session_state.app_start_time = datetime.now()
+    # Monotonic twin for elapsed-time math on every rerun
+    if 'app_start_monotonic' not in st.session_state:
+        st.session_state.app_start_monotonic = time.monotonic()
     return st.session_state.app_start_time
 
+def _backup_risk_context():
+    """Container age, hours since last backup and database stats, computed once per rerun"""
+    run_id = st.session_state.get('_rerun_id')
+    context = st.session_state.get('_backup_risk_context')
+    
+    if context is None or context['run_id'] != run_id:
+        # Elapsed times use monotonic floats; datetimes are kept only for display
+        now = time.monotonic()
+        get_container_start_time()
+        app_start = st.session_state.get('app_start_monotonic')
+        last_backup = st.session_state.get('last_backup_monotonic')
+        context = {
+            'run_id': run_id,
+            'hours_running': (now - app_start) / 3600 if app_start is not None else None,
+            # Default to high value if no backup
+            'hours_since_backup': (now - last_backup) / 3600 if last_backup is not None else 999,
+            'stats': _db_stats()
+        }
+        st.session_state._backup_risk_context = context
+    
+    return context
+
 def check_critical_backup_needs(db_manager):
     """Check for critical backup needs at app startup"""
     try:
-        stats = db_manager.get_database_stats()
+        stats = _db_stats()
         total_data_points = (stats['customer_mappings'] + 
                            stats['upload_history'] + 
                            stats['brokerage_configurations'])
         
-        # Only show critical warnings if there's significant data
-        if total_data_points > 0:
-            container_start_time = get_container_start_time()
-            if container_start_time:
-                hours_running = (datetime.now() - container_start_time).total_seconds() / 3600
-                
-                # Show critical backup warning at top of app
-                if hours_running > 168:  # 7 days
-                    st.error("🚨 **CRITICAL**: Container running for 7+ days. Data loss imminent! Download backup immediately.")
-                elif hours_running > 72:  # 3 days
-                    st.warning("⚠️ **HIGH RISK**: Container running for 3+ days. Download backup before continuing.")
-                elif hours_running > 48:  # 2 days
-                    st.info("⏰ **REMINDER**: Container running for 2+ days. Consider downloading backup soon.")
-                    
-                # Check for large datasets without recent backups
-                if total_data_points > 50:
-                    last_backup_time = st.session_state.get('last_backup_time')
-                    if not last_backup_time or (datetime.now() - last_backup_time).total_seconds() > 86400:  # 24 hours
-                        st.warning("💾 **BACKUP RECOMMENDED**: Large dataset detected. Download backup to prevent data loss.")
+        # Only show critical warnings if there's significant data; an empty
+        # database (the common case) skips the container-age math entirely
+        if total_data_points == 0:
+            return
+        
+        risk = _backup_risk_context()
+        hours_running = risk['hours_running']
+        if hours_running is None:
+            return
+        
+        # Show critical backup warning at top of app
+        if hours_running > 168:  # 7 days
+            st.error("🚨 **CRITICAL**: Container running for 7+ days. Data loss imminent! Download backup immediately.")
+        elif hours_running > 72:  # 3 days
+            st.warning("⚠️ **HIGH RISK**: Container running for 3+ days. Download backup before continuing.")
+        elif hours_running > 48:  # 2 days
+            st.info("⏰ **REMINDER**: Container running for 2+ days. Consider downloading backup soon.")
+        
+        # Check for large datasets without recent backups
+        if total_data_points > 50 and risk['hours_since_backup'] > 24:
+            st.warning("💾 **BACKUP RECOMMENDED**: Large dataset detected. Download backup to prevent data loss.")
     except Exception as e:
         # Don't let backup checks break the app
         pass
 
 def auto_backup_suggestion():
     """Suggest backup after significant operations with intelligent timing"""
+    # Render at most once per script run (the deferred and in-flow call sites can coincide)
+    run_id = st.session_state.get('_rerun_id')
+    if run_id is not None and st.session_state.get('_backup_suggestion_run') == run_id:
+        return
+    st.session_state._backup_suggestion_run = run_id
+    
     # Track operations that warrant backup
     if 'significant_operations' not in st.session_state:
         st.session_state.significant_operations = 0
     
     st.session_state.significant_operations += 1
     
-    # Check time since last backup
-    last_backup_time = st.session_state.get('last_backup_time')
-    hours_since_backup = 999  # Default to high value if no backup
-    
-    if last_backup_time:
-        hours_since_backup = (datetime.now() - last_backup_time).total_seconds() / 3600
-    
-    # Get container age for risk assessment
-    container_start_time = get_container_start_time()
-    hours_running = 0
-    if container_start_time:
-        hours_running = (datetime.now() - container_start_time).total_seconds() / 3600
-    
-    # Calculate database stats for risk assessment
-    from src.backend.database import DatabaseManager
-    db_manager = DatabaseManager()
-    stats = db_manager.get_database_stats()
+    # Time since last backup, container age and database stats for risk assessment
+    risk = _backup_risk_context()
+    hours_since_backup = risk['hours_since_backup']
+    hours_running = risk['hours_running'] or 0
+    stats = risk['stats']
     total_data_points = (stats['customer_mappings'] + 
                         stats['upload_history'] + 
                         stats['brokerage_configurations'])
@@ -3323,20 +3543,37 @@ def auto_backup_suggestion():
         elif st.session_state.significant_operations % 10 == 0:
             st.caption("💾 Consider downloading a backup to preserve your work")
     
-    # Show backup shortcut if critical
+    # Show backup shortcut if critical. The archive is only built after the user asks
+    # for it; until then a plain button stands in for the download
     if hours_running > 72 or (total_data_points > 20 and hours_since_backup > 24):
-        if st.button("📥 Quick Backup", key="quick_backup_urgent", type="primary"):
-            backup_data = create_database_backup()
+        if st.session_state.get('_quick_backup_requested'):
             current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
             st.download_button(
                 label="💾 Download Emergency Backup",
-                data=backup_data,
-                file_name=f"ff2api_emergency_backup_{current_time}.json",
-                mime="application/json",
-                key="emergency_backup_download"
+                data=create_database_backup(),
+                file_name=f"ff2api_emergency_backup_{current_time}.zip",
+                mime="application/zip",
+                key="emergency_backup_download",
+                type="primary",
+                on_click=_record_backup_download
             )
-            st.session_state.last_backup_time = datetime.now()
-            st.success("✅ Emergency backup ready!")
+        else:
+            st.button("📥 Quick Backup", key="quick_backup_urgent", type="primary",
+                      on_click=_request_quick_backup)
+    else:
+        st.session_state.pop('_quick_backup_requested', None)
+
+# Widget callbacks run at the start of the next run even if the widget is not rendered
+# again, so these work when the suggestion was shown only once (e.g. deferred after a save)
+def _request_quick_backup():
+    """Ask for the emergency backup download to be prepared on the next run"""
+    st.session_state._quick_backup_requested = True
+
+def _record_backup_download():
+    """Track backup time when the emergency backup is downloaded"""
+    st.session_state.last_backup_time = datetime.now()
+    st.session_state.last_backup_monotonic = time.monotonic()
+    st.session_state._quick_backup_requested = False
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
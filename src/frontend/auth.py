@@ -0,0 +1,86 @@
+"""
+Login gate for the FF2API app.
+
+Kept free of pandas and the backend modules so the login page can be served
+without importing them.
+"""
+
+import hmac
+import logging
+from datetime import datetime
+from functools import lru_cache
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+def check_password():
+    """Check if the user is authenticated"""
+    return st.session_state.get('authenticated', False)
+
+@lru_cache(maxsize=1)
+def _get_correct_password():
+    """Read the app password from secrets once per process"""
+    # Get password from secrets
+    if 'auth' in st.secrets and 'APP_PASSWORD' in st.secrets.auth:
+        return str(st.secrets.auth.APP_PASSWORD)
+    # Fallback for local development
+    return "admin123"
+
+def authenticate_user(password):
+    """Authenticate user with password"""
+    try:
+        # Constant-time comparison so response time does not leak matching prefixes
+        return hmac.compare_digest(password.encode(), _get_correct_password().encode())
+    except Exception as e:
+        logger.error(f"Authentication error: {e}")
+        return False
+
+def show_login_page():
+    """Display login page"""
+    st.set_page_config(
+        page_title="FF2API - Login",
+        page_icon="🔐",
+        layout="centered"
+    )
+
+    # Center the login form
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col2:
+        st.markdown("""
+            <div style="text-align: center; margin-bottom: 2rem;">
+                <h1>🔐 FF2API Access</h1>
+                <p style="color: #666; font-size: 1.1rem;">Enter your team password to continue</p>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # Login form
+        with st.form("login_form"):
+            password = st.text_input(
+                "Password",
+                type="password",
+                placeholder="Enter team password",
+                help="Contact your team administrator if you don't have the password"
+            )
+
+            submitted = st.form_submit_button("🚀 Access Application", use_container_width=True)
+
+            if submitted:
+                if authenticate_user(password):
+                    st.session_state.authenticated = True
+                    st.session_state.login_time = datetime.now()
+                    st.success("✅ Access granted! Redirecting...")
+                    st.rerun()
+                else:
+                    st.error("❌ Incorrect password. Please try again.")
+                    st.info("💡 Contact your team administrator if you need help accessing the application.")
+
+        # App info
+        st.markdown("---")
+        st.markdown("""
+            <div style="text-align: center; color: #666; font-size: 0.9rem;">
+                <p><strong>FF2API</strong> - Freight File to API Processing Tool</p>
+                <p>For internal company use only</p>
+            </div>
+        """, unsafe_allow_html=True)
@@ -66,12 +66,9 @@ def _render_update_configuration_form(config_to_update, brokerage_name, db_manag
         with col2:
             if st.form_submit_button("❌ Cancel", use_container_width=True):
                 st.session_state.show_update_form = False
-                if 'update_form_state' in st.session_state:
-                    del st.session_state.update_form_state
-                if 'config_update_error' in st.session_state:
-                    del st.session_state.config_update_error
-                if 'config_update_success' in st.session_state:
-                    del st.session_state.config_update_success
+                st.session_state.pop('update_form_state', None)
+                st.session_state.pop('config_update_error', None)
+                st.session_state.pop('config_update_success', None)
                 st.rerun()
     
     # Handle form submission
@@ -154,6 +151,7 @@ def _handle_update_configuration(config_to_update, brokerage_name, db_manager):
                         auth_type=auth_type,
                         bearer_token=save_bearer_token
                     )
+                    st.session_state._stats_dirty = True
                     
                     # Explicitly increment version in database after save
                     import sqlite3
@@ -194,8 +192,7 @@ def _handle_update_configuration(config_to_update, brokerage_name, db_manager):
                     st.session_state.config_to_update = updated_config
                     
                     # Clear update form state
-                    if 'update_form_state' in st.session_state:
-                        del st.session_state.update_form_state
+                    st.session_state.pop('update_form_state', None)
                     
                     # Hide update form and show success
                     st.session_state.show_update_form = False
@@ -244,6 +241,7 @@ def _immediate_save_field_mapping(field: str, selected_column: str, db_manager,
             auth_type=config.get('auth_type', 'api_key'),
             bearer_token=config.get('bearer_token')
         )
+        st.session_state._stats_dirty = True
         
         # Update the session state configuration and field mappings to reflect the save
         st.session_state.selected_configuration['field_mappings'] = current_mappings
@@ -15,13 +15,19 @@ from src.backend.data_processor import DataProcessor
 from src.backend.api_client import get_brokerage_key
 import os
 import time
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
 def get_full_api_schema():
-    """Get the complete API schema for validation - aligned with API requirements"""
+    """Get the complete API schema for validation - aligned with API requirements
+    
+    The schema is static, so it is built once per process. Callers share the
+    returned dict and must copy entries before modifying them.
+    """
     return {
         # Core Required Fields (Always Required)
         'load.loadNumber': {'type': 'string', 'required': True, 'description': 'Load Number'},
@@ -135,6 +141,15 @@ def get_full_api_schema():
         'load.trackingEvents.0.notes': {'type': 'string', 'required': False, 'description': 'Event Notes'},
     }
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def suggest_mapping_cached(_data_processor, df):
+    """Smart mapping suggestions for an uploaded DataFrame against the full API schema.
+    
+    Cached on the DataFrame contents, so reruns with the same upload skip the
+    per-column analysis. Returns a copy that callers may modify.
+    """
+    return _data_processor.suggest_mapping(df.columns, get_full_api_schema(), df)
+
 def get_dynamic_field_requirements(api_schema, current_mappings):
     """
     Determine which fields should be required based on current mappings.
@@ -934,9 +949,15 @@ def render_full_validation_error_details(validation_errors):
                 with st.expander(f"🔍 {row_info}", expanded=False):
                     st.text_area("Full Error Details:", value=str(error), height=100, disabled=True, key=f"validation_error_detail_{id(error)}")
 
-def create_validation_summary_card(validation_errors: list, total_records: int):
-    """Create a smart validation summary - detailed only when needed"""
-    error_count = len(validation_errors)
+def create_validation_summary_card(validation_errors: list, total_records: int, error_count: Optional[int] = None):
+    """Create a smart validation summary - detailed only when needed
+    
+    error_count is the full number of issues when validation_errors has been truncated.
+    """
+    if error_count is None:
+        error_count = len(validation_errors)
+    truncated_note = (f"Showing the first {len(validation_errors)} of {error_count} issues"
+                      if error_count > len(validation_errors) else None)
     success_count = total_records - error_count
     success_rate = (success_count / total_records * 100) if total_records > 0 else 100
     
@@ -955,6 +976,8 @@ def create_validation_summary_card(validation_errors: list, total_records: int):
             
             # Add full error details for truncated errors
             render_full_validation_error_details(validation_errors)
+            if truncated_note:
+                st.caption(truncated_note)
         return True
     else:
         # Significant issues - show details
@@ -978,6 +1001,8 @@ def create_validation_summary_card(validation_errors: list, total_records: int):
             
             # Add full error details for truncated errors
             render_full_validation_error_details(validation_errors)
+            if truncated_note:
+                st.caption(truncated_note)
         
         return False
 
@@ -1280,7 +1305,7 @@ def create_enhanced_mapping_interface(df, existing_mappings, data_processor):
     if not existing_mappings:
         with st.spinner("🧠 Generating smart mapping suggestions..."):
             try:
-                suggested_mappings = data_processor.suggest_mapping(list(df.columns), api_schema, df)
+                suggested_mappings = suggest_mapping_cached(data_processor, df)
                 if suggested_mappings:
                     st.success(f"✨ Generated {len(suggested_mappings)} smart mapping suggestions!")
                     field_mappings.update(suggested_mappings)
@@ -1766,7 +1791,7 @@ def create_enhanced_mapping_with_validation(df, existing_configuration, data_pro
     if not field_mappings or (header_comparison and header_comparison.get('added')):
         with st.spinner("🧠 Generating smart mapping suggestions..."):
             try:
-                suggested_mappings = data_processor.suggest_mapping(list(df.columns), api_schema, df)
+                suggested_mappings = suggest_mapping_cached(data_processor, df)
                 
                 # Only add suggestions that don't conflict with existing mappings
                 for field, column in suggested_mappings.items():
@@ -2181,7 +2206,7 @@ def create_learning_enhanced_mapping_interface(df, existing_mappings, data_proce
                                f"(avg {insights['avg_acceptance_rate']:.1f} suggestions accepted)")
                 else:
                     # Fallback to basic suggestions
-                    suggested_mappings = data_processor.suggest_mapping(list(df.columns), api_schema, df)
+                    suggested_mappings = suggest_mapping_cached(data_processor, df)
                 
                 if suggested_mappings:
                     st.success(f"✨ Generated {len(suggested_mappings)} smart mapping suggestions!")
@@ -2856,6 +2881,7 @@ def _immediate_save_field_mapping(field: str, selected_column: str, db_manager,
             auth_type=config.get('auth_type', 'api_key'),
             bearer_token=config.get('bearer_token')
         )
+        st.session_state._stats_dirty = True
         
         # Update the session state configuration to reflect the save
         st.session_state.selected_configuration['field_mappings'] = current_mappings
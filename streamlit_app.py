@@ -8,9 +8,23 @@ It imports and runs the main application from src/frontend/app.py
 import sys
 import os
 
+import streamlit as st
+
 # Add src directory to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Serve the login page to logged-out visitors before importing the app, which
+# pulls in pandas, the backend modules and ui_components
+try:
+    from src.frontend.auth import check_password, show_login_page
+except ImportError:
+    # Fallback import path
+    from frontend.auth import check_password, show_login_page
+
+if not check_password():
+    show_login_page()
+    st.stop()
+
 # Import and run the main application
 if __name__ == "__main__":
     try:
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Check that the vectorized validator reports exactly the same errors as the row-by-row one
+"""
+
+import sys
+
+# Add src to path
+sys.path.append('src')
+
+import pandas as pd
+
+# Small schema covering each kind of check: required, enum, number and date
+PARITY_SCHEMA = {
+    'load.loadNumber': {'type': 'string', 'required': True, 'description': 'Load Reference Number'},
+    'load.mode': {'type': 'string', 'required': False, 'enum': ['FTL', 'LTL', 'DRAYAGE']},
+    'load.items.0.totalWeightLbs': {'type': 'number', 'required': False},
+    'load.items.0.quantity': {'type': 'integer', 'required': False},
+    'load.route.0.expectedArrivalWindowStart': {'type': 'date', 'required': False},
+    'load.notes': {'type': 'string', 'required': False},
+}
+
+def _make_processor():
+    from backend.data_processor import DataProcessor
+
+    processor = DataProcessor()
+    processor.api_schema = PARITY_SCHEMA
+    return processor
+
+def _assert_parity(processor, df):
+    """Both validators must flag the same rows with the same messages"""
+    row_errors = [(e['row'], e['errors']) for e in processor._validate_chunk(df, 0)]
+    _, vectorized = processor.validate_data_vectorized(df, PARITY_SCHEMA, include_data=False)
+    vectorized_errors = [(e['row'], e['errors']) for e in vectorized]
+    assert row_errors == vectorized_errors, f"{row_errors} != {vectorized_errors}"
+
+def test_mixed_text_columns():
+    """Blanks, whitespace, numeric strings, dates and enum values as text"""
+    df = pd.DataFrame({
+        'load.loadNumber': ['L1', '', '   ', None, 'L5', 'L6', 'L7'],
+        'load.mode': ['FTL', 'ltl', 'XYZ', '', ' ', None, 'Drayage'],
+        'load.items.0.totalWeightLbs': ['12', ' 3.5 ', 'abc', '', '1e3', 'nan', '1_000'],
+        'load.items.0.quantity': ['1', '2.0', 'two', None, '  ', '-4', 'inf'],
+        'load.route.0.expectedArrivalWindowStart': ['2024-01-01', '01/02/2024', 'not a date', '', None,
+                                                    '2024-01-01T10:00:00', '2024-13-45'],
+        'load.notes': ['a', '', None, ' ', 'b', 'c', 'd'],
+    })
+    _assert_parity(_make_processor(), df)
+
+def test_typed_columns():
+    """Native numeric and datetime dtypes, including datetimes mapped to number fields"""
+    df = pd.DataFrame({
+        'load.loadNumber': ['L1', 'L2', 'L3'],
+        'load.items.0.totalWeightLbs': pd.to_datetime(['2024-01-01', None, '2024-03-01']),
+        'load.items.0.quantity': [1, 2, 3],
+        'load.route.0.expectedArrivalWindowStart': pd.to_datetime(['2024-01-01', '2024-02-01', None]),
+    })
+    _assert_parity(_make_processor(), df)
+
+def test_object_values():
+    """Object columns holding mixed Python values"""
+    df = pd.DataFrame({
+        'load.loadNumber': ['L1', 'L2', 'L3', 'L4'],
+        'load.mode': ['FTL', 1, None, 'ltl'],
+        'load.items.0.totalWeightLbs': [1.5, '2', pd.Timestamp('2024-01-01'), True],
+        'load.route.0.expectedArrivalWindowStart': [pd.Timestamp('2024-01-01'), '2024-02-01', 'soon', 5],
+    }, dtype=object)
+    _assert_parity(_make_processor(), df)
+
+def main():
+    """Run all parity tests"""
+    tests = [test_mixed_text_columns, test_typed_columns, test_object_values]
+    tests_passed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+            tests_passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"Tests completed: {tests_passed}/{len(tests)} passed")
+    return tests_passed == len(tests)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)